@@ -0,0 +1 @@
+"""Submodule containing the default formatters for Flake8."""
@@ -0,0 +1 @@
+"""Module containing the logic for the Flake8 entry-points."""
@@ -0,0 +1 @@
+"""Submodule of built-in plugins and plugin managers."""
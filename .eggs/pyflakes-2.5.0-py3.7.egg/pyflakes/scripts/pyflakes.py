@@ -0,0 +1,7 @@
+"""
+Implementation of the command-line I{pyflakes} tool.
+"""
+
+# For backward compatibility
+__all__ = ['check', 'checkPath', 'checkRecursive', 'iterSourceCode', 'main']
+from pyflakes.api import check, checkPath, checkRecursive, iterSourceCode, main
@@ -0,0 +1,61 @@
+"""
+Micro benchmarks of the placeholder access paths.
+
+    python benchmarks/bench_factory.py
+"""
+from timeit import repeat
+
+from baluster import Baluster, placeholders
+
+
+class Root(Baluster):
+
+    @placeholders.factory
+    def cached(self, root):
+        return 1
+
+    @placeholders.factory(cache=False)
+    def uncached(self, root):
+        return 1
+
+    @placeholders.factory(cache=False, args=['root', 'env', 'debug'])
+    def uncached_params(self, root, env, debug):
+        return 1
+
+
+class CompiledRoot(Root, compiled=True):
+
+    @placeholders.factory
+    def cached(self, root):
+        return 1
+
+    @placeholders.factory(cache=False)
+    def uncached(self, root):
+        return 1
+
+
+def bench(name, stmt, number=50000):
+    best = min(repeat(stmt, number=number, repeat=7))
+    print('{:<24} {:>8.0f} ns'.format(name, best / number * 1e9))
+
+
+def main():
+    root = Root(env='production', debug=0)
+    root.cached
+    bench('cached', lambda: root.cached)
+    bench('uncached', lambda: root.uncached)
+    bench('uncached with params', lambda: root.uncached_params)
+    bench('enter', lambda: root.enter())
+    compiled = CompiledRoot()
+    compiled.cached
+    bench('compiled cached', lambda: compiled.cached)
+    bench('compiled uncached', lambda: compiled.uncached)
+    bench('compiled enter', lambda: compiled.enter())
+    frozen = Root()
+    frozen.cached
+    frozen.freeze('cached')
+    bench('frozen cached', lambda: frozen.cached)
+
+
+if __name__ == '__main__':
+    main()
@@ -31,12 +31,12 @@ if __name__ == '__main__':
             'Intended Audience :: Developers',
             'License :: OSI Approved :: MIT License',
             'Natural Language :: English',
-            'Programming Language :: Python :: 3.6',
+            'Programming Language :: Python :: 3.7',
             'Operating System :: OS Independent',
         ],
         keywords=('context', 'context manager', 'async',),
         zip_safe=False,
-        python_requires='>=3.6',
+        python_requires='>=3.7',
         install_requires=[],
         setup_requires=['pytest-runner', 'flake8'],
         tests_require=['pytest-asyncio', 'pytest-cov', 'colorama', 'pytest'],
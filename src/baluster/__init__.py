@@ -1,3 +1,13 @@
 from .baluster import AsyncBaluster, Baluster                          # noqa
-from .exceptions import MultipleExceptions, ContextManagerReusedError  # noqa
+from .exceptions import (                                              # noqa
+    MultipleExceptions, ContextManagerReusedError, NoCurrentScopeError,
+    UnresolvedArgumentError, FrozenError
+)
+from .scope import current_scope                                       # noqa
+from .analysis import dependency_graph                                 # noqa
+from .closer import BackgroundCloser                                   # noqa
+from .proxy import is_created                                          # noqa
+from .health import HealthChecker                                      # noqa
+from .builds import SharedBuilds, xdist_builds                         # noqa
+from .retry import Retry                                               # noqa
 from . import placeholders                                             # noqa
@@ -0,0 +1,207 @@
+import ast
+from inspect import getsource, signature
+from textwrap import dedent
+from weakref import WeakKeyDictionary
+
+from .binding import LOOKUP, MEMBER, ROOT
+from .utils import get_member_name
+
+
+_graphs = WeakKeyDictionary()
+
+
+def dependency_graph(cls):
+    try:
+        return _graphs[cls]
+    except KeyError:
+        graph = _graphs[cls] = Analyser(cls).analyse()
+        return graph
+
+
+class DependencyGraph:
+
+    __slots__ = ('_dependencies', '_params', '_unresolved')
+
+    def __init__(self, dependencies, params, unresolved):
+        self._dependencies = dependencies
+        self._params = params
+        self._unresolved = unresolved
+
+    @property
+    def keys(self):
+        return tuple(self._dependencies)
+
+    @property
+    def unresolved(self):
+        return dict(self._unresolved)
+
+    def dependencies_of(self, key):
+        return self._dependencies.get(key, frozenset())
+
+    def params_of(self, key):
+        return self._params.get(key, frozenset())
+
+    def dependents_of(self, *keys):
+        found = set()
+        pending = list(keys)
+        while pending:
+            current = pending.pop()
+            for key, dependencies in self._dependencies.items():
+                if current in dependencies and key not in found:
+                    found.add(key)
+                    pending.append(key)
+        return found
+
+    def dependents_of_params(self, *names):
+        direct = {
+            key for key, params in self._params.items()
+            if params.intersection(names)
+        }
+        return direct | self.dependents_of(*direct)
+
+    def levels(self, *keys):
+        required = self._with_dependencies(keys or self.keys)
+        levels = []
+        done = set()
+        while required - done:
+            level = {
+                key for key in required - done
+                if self.dependencies_of(key) <= done
+            }
+            if not level:
+                raise ValueError(
+                    'Circular dependency between {keys}'.format(
+                        keys=', '.join(sorted(required - done))
+                    )
+                )
+            levels.append(tuple(sorted(level)))
+            done |= level
+        return levels
+
+    def _with_dependencies(self, keys):
+        found = set()
+        pending = list(keys)
+        while pending:
+            key = pending.pop()
+            if key not in found:
+                found.add(key)
+                pending.extend(self.dependencies_of(key))
+        return found
+
+
+class Analyser:
+
+    def __init__(self, cls):
+        self._cls = cls
+        self._dependencies = dict()
+        self._params = dict()
+        self._unresolved = dict()
+
+    def analyse(self):
+        self._analyse_class(self._cls, None)
+        return DependencyGraph(
+            {k: frozenset(v) for k, v in self._dependencies.items()},
+            {k: frozenset(v) for k, v in self._params.items()},
+            {k: tuple(v) for k, v in self._unresolved.items()}
+        )
+
+    def _analyse_class(self, cls, prefix):
+        for maker in cls._makers:
+            self._analyse_maker(prefix, maker)
+        for name, nested in cls._nested:
+            self._analyse_class(nested, get_member_name(prefix, name))
+
+    def _analyse_maker(self, prefix, maker):
+        key = get_member_name(prefix, maker._name)
+        self._dependencies[key] = set()
+        self._params[key] = set()
+        param = getattr(maker, 'param', None)
+        if param is not None:
+            self._params[key].add(param)
+        func = getattr(maker, '_func', None)
+        if func is None:
+            return
+        names = self._bind_arguments(key, prefix, maker, func)
+        try:
+            tree = ast.parse(dedent(getsource(func)))
+        except (OSError, TypeError, SyntaxError):
+            self._report(key, '<source of {}>'.format(func.__qualname__))
+            return
+        visitor = AccessVisitor(names)
+        visitor.visit(tree.body[0])
+        for base, parts in visitor.accesses:
+            self._resolve_access(key, base, names[base], parts)
+        for name in visitor.escapes:
+            self._report(key, name)
+
+    def _bind_arguments(self, key, prefix, maker, func):
+        parameters = list(signature(func).parameters)
+        names = {parameters[0]: prefix}
+        for name, argument in zip(parameters[1:], maker.arguments):
+            if argument.source == ROOT:
+                names[name] = None
+            elif argument.source == MEMBER:
+                self._dependencies[key].add(
+                    get_member_name(prefix, argument.name)
+                )
+            elif argument.source == LOOKUP and \
+                    argument.name in self._cls._member_names:
+                self._resolve_access(key, 'root', None, [argument.name])
+            else:
+                self._params[key].add(argument.name)
+        return names
+
+    def _resolve_access(self, key, base, prefix, parts):
+        cls = self._find_class(prefix)
+        for i, part in enumerate(parts):
+            nested = dict(cls._nested).get(part)
+            if nested is not None:
+                cls, prefix = nested, get_member_name(prefix, part)
+                continue
+            if part in (m._name for m in cls._makers):
+                self._dependencies[key].add(get_member_name(prefix, part))
+                return
+            if hasattr(cls, part) and not callable(getattr(cls, part)):
+                return
+            break
+        self._report(key, '.'.join([base] + parts[:i + 1]))
+
+    def _find_class(self, prefix):
+        cls = self._cls
+        for part in (prefix.split('.') if prefix else []):
+            cls = dict(cls._nested)[part]
+        return cls
+
+    def _report(self, key, expression):
+        self._unresolved.setdefault(key, [])
+        if expression not in self._unresolved[key]:
+            self._unresolved[key].append(expression)
+
+
+class AccessVisitor(ast.NodeVisitor):
+
+    def __init__(self, names):
+        self._names = names
+        self.accesses = []
+        self.escapes = []
+
+    def visit_FunctionDef(self, node):
+        for statement in node.body:
+            self.visit(statement)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_Attribute(self, node):
+        parts = []
+        current = node
+        while isinstance(current, ast.Attribute):
+            parts.insert(0, current.attr)
+            current = current.value
+        if isinstance(current, ast.Name) and current.id in self._names:
+            self.accesses.append((current.id, parts))
+        else:
+            self.generic_visit(node)
+
+    def visit_Name(self, node):
+        if node.id in self._names and node.id not in self.escapes:
+            self.escapes.append(node.id)
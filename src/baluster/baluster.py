@@ -1,16 +1,31 @@
-from inspect import isclass
+from asyncio import gather, wait_for
+from inspect import isawaitable, isclass
+import os
+from threading import local
+from weakref import finalize
 
+from .analysis import dependency_graph
+from .compiler import (
+    compile_accessors, compile_init, compile_new, is_compiled
+)
+from .frozen import freeze
 from .manager import Manager, AsyncManager
 from .state import State
 from .mediator import Mediator
-from .makers import BaseMaker
+from .proxy import LazyProxy, is_created
+from .makers import (
+    BaseMaker, ValueMaker, FactoryMaker, AsyncFactoryMaker, KeyedFactoryMaker
+)
 from .utils import (
-    capture_exceptions, as_async, get_member_name, find_instance
+    capture_exceptions, as_async_in, get_member_name, find_instance,
+    run_in_executor
 )
 
 
 class BaseBaluster:
 
+    _thread_origin = None
+
     def __init__(self, _state=None, _parent=None, **params):
         self._parent = _parent
         if _parent is not None:
@@ -23,6 +38,17 @@ class BaseBaluster:
             self._root = self
             self._name = None
             self._state = _state or State(params=params)
+            self._thread_scopes = local()
+
+    @property
+    def _unfrozen_class(self):
+        return self.__class__
+
+    def _new_scope(self):
+        scope = self._unfrozen_class(self._state.new_child())
+        if self._thread_origin is not None:
+            scope._thread_origin = self
+        return scope
 
     def __getitem__(self, name):
         return self._state.get_data(name)
@@ -37,45 +63,105 @@ class BaseBaluster:
         return self._state.has_data(name)
 
 
+class ThreadGuard:
+    # Kept in a thread local storage, collected when the thread exits
+    pass
+
+
+COMPILE = bool(os.environ.get('BALUSTER_COMPILE'))
+
+
 class BalusterType(type):
 
-    def __new__(cls, name, bases, defined_members):
+    def __new__(
+        cls, name, bases, defined_members, *, analyse=False, compiled=None
+    ):
         makers = []
         nested = []
+        member_names = set()
         members = dict()
+        defined_makers = []
 
         for base in bases:
             if hasattr(base, '_makers'):
                 makers += base._makers
             if hasattr(base, '_nested'):
                 nested += base._nested
+            if hasattr(base, '_member_names'):
+                member_names |= base._member_names
 
         for k, v in defined_members.items():
             if isinstance(v, BaseMaker):
-                makers.append(v)
+                defined_makers.append(v)
+                member_names.add(k)
             if isclass(v) and issubclass(v, BaseBaluster):
                 nested.append((k, v))
+                member_names.add(k)
             members[k] = v
 
-        members['_makers'] = tuple(makers)
+        members['_makers'] = tuple(makers + defined_makers)
         members['_nested'] = tuple(nested)
-        return super().__new__(cls, name, bases, members)
+        members['_member_names'] = frozenset(member_names)
+        new_cls = super().__new__(cls, name, bases, members)
+        for maker in defined_makers:
+            maker.prepare(new_cls)
+        if (COMPILE if compiled is None else compiled) and \
+                (new_cls._makers or new_cls._nested):
+            new_cls._compile(defined_makers)
+        if analyse:
+            dependency_graph(new_cls)
+        return new_cls
 
 
-class Baluster(BaseBaluster, metaclass=BalusterType):
+def _walk_makers(cls, prefix=None):
+    for maker in cls._makers:
+        yield get_member_name(prefix, maker._name), maker
+    for name, nested in cls._nested:
+        yield from _walk_makers(nested, get_member_name(prefix, name))
 
-    def __new__(cls, *args, **kwargs):
 
-        def mediator_factory(name, instance):
-            return Mediator(
-                name, instance,
-                lambda i: (i._root, i._root._state, i._name)
-            )
+def _is_compilable(maker):
+    return isinstance(maker, (ValueMaker, FactoryMaker)) and \
+        not isinstance(maker, (AsyncFactoryMaker, KeyedFactoryMaker))
+
+
+def _extract(instance):
+    return instance._root, instance._root._state, instance._name
 
+
+def mediator_factory(name, instance):
+    return Mediator(name, instance, _extract)
+
+
+def _needs_init(maker):
+    if type(maker).init is BaseMaker.init:
+        return False
+    return type(maker).init is not FactoryMaker.init or \
+        maker._inject is not None
+
+
+class Baluster(BaseBaluster, metaclass=BalusterType):
+
+    def __new__(cls, *args, **kwargs):
         for maker in cls._makers:
             maker.bind(mediator_factory)
         return super(Baluster, cls).__new__(cls)
 
+    @classmethod
+    def _compile(cls, defined_makers):
+        compile_accessors(cls, [
+            m for m in defined_makers if _is_compilable(m)
+        ])
+        if cls.__new__ is Baluster.__new__ or is_compiled(cls.__new__):
+            for maker in cls._makers:
+                maker.bind(mediator_factory)
+            compile_new(cls, Baluster.__new__)
+        if cls.__init__ is Baluster.__init__ or is_compiled(cls.__init__):
+            compile_init(
+                cls, [m for m in cls._makers if _needs_init(m)],
+                BaseBaluster.__init__, Baluster.__init__
+            )
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         for name, nested in self._nested:
@@ -84,13 +170,90 @@ class Baluster(BaseBaluster, metaclass=BalusterType):
             maker.init(self)
 
     def partial_copy(self, *names):
-        return self.__class__(self._state.partial_copy(names))
+        return self._unfrozen_class(self._state.partial_copy(names))
 
     def inject_config(self, binder):
         self._state.map_inject_providers(binder.bind_to_provider)
 
-    def enter(self):
-        return Manager(self.__class__(self._state.new_child()))
+    def build_many(self, name, count, **overrides):
+        maker = getattr(self._unfrozen_class, name)
+        return maker.build_many(maker.get_mediator(self), count, overrides)
+
+    def enter(self, *, publish=False):
+        return Manager(self._new_scope(), publish=publish)
+
+    def freeze(self, *names):
+        for name in names:
+            if not self._state.has_resource(name):
+                raise ValueError(
+                    'Cannot freeze, `{name}` is not resolved'.format(
+                        name=name
+                    )
+                )
+        freeze(self)
+        return self
+
+    def get_stats(self):
+        return self._state.get_stats()
+
+    def set_shared_builds(self, shared_builds):
+        self._state.set_shared_builds(shared_builds)
+
+    def thread_scope(self):
+        if self._parent is not None:
+            scope = self._root.thread_scope()
+            for name in self._name.split('.'):
+                scope = getattr(scope, name)
+            return scope
+        scopes = self._thread_scopes
+        scope = getattr(scopes, 'scope', None)
+        if scope is None:
+            scope = self._unfrozen_class(self._state.new_child())
+            scope._thread_origin = self
+            scopes.scope = scope
+            scopes.guard = ThreadGuard()
+            finalize(scopes.guard, scope.close)
+        return scope
+
+    def invalidate(self, name, *, cascade=False):
+        self._invalidate_keys(self._find_invalidated(name, cascade))
+
+    def update_params(self, **changes):
+        self._invalidate_keys(self._find_outdated(changes))
+
+    def _invalidate_keys(self, keys):
+        self._root._state.discard_failures(keys)
+        handlers = self._root._state.pop_close_handlers(keys)
+        with capture_exceptions() as capture:
+            for key, handler, resource in handlers:
+                instance = find_instance(self._root, key)
+                with capture():
+                    handler(instance, self._root, resource)
+            self._root._state.discard_resources(keys)
+
+    def _find_invalidated(self, name, cascade):
+        key = get_member_name(self._name, name)
+        keys = {key}
+        if cascade:
+            graph = dependency_graph(self._root.__class__)
+            keys |= graph.dependents_of(key)
+        return self._filter_cached(keys)
+
+    def _find_outdated(self, changes):
+        state = self._root._state
+        params = state.get_params()
+        changed = [
+            name for name, value in changes.items()
+            if name not in params or params[name] != value
+        ]
+        state.update_params(changes)
+        graph = dependency_graph(self._root.__class__)
+        return self._filter_cached(graph.dependents_of_params(*changed))
+
+    def _filter_cached(self, keys):
+        state = self._root._state
+        failed = state.failed_keys()
+        return {k for k in keys if state.has_resource(k) or k in failed}
 
     def close(self):
         handlers = self._state.get_close_handlers()
@@ -100,18 +263,120 @@ class Baluster(BaseBaluster, metaclass=BalusterType):
                 with capture():
                     handler(instance, self, resource)
             self._state.clear_close_handlers()
+            pool = self._state.pop_process_pool()
+            if pool is not None:
+                pool.shutdown()
 
 
 class AsyncBaluster(Baluster):
 
-    def enter(self):
-        return AsyncManager(self.__class__(self._state.new_child()))
+    def enter(
+        self, *, publish=False, prefetch=(), closer=None, timeout=None
+    ):
+        return AsyncManager(
+            self._new_scope(), publish=publish, prefetch=prefetch,
+            closer=closer, timeout=timeout
+        )
+
+    def prefetch(self, *names):
+        targets = []
+        for name in names:
+            instance = find_instance(self, name)
+            maker = getattr(
+                instance._unfrozen_class, name.rsplit('.', 1)[-1]
+            )
+            if not isinstance(maker, AsyncFactoryMaker):
+                raise TypeError(
+                    'Cannot prefetch `{name}`, it is not an async '
+                    'factory'.format(name=name)
+                )
+            targets.append((maker, instance))
+        tasks = []
+        for maker, instance in targets:
+            task = maker.prefetch(maker.get_mediator(instance))
+            if task is not None:
+                tasks.append(task)
+        return tasks
+
+    async def ainvalidate(self, name, *, cascade=False):
+        await self._ainvalidate_keys(self._find_invalidated(name, cascade))
+
+    async def aupdate_params(self, **changes):
+        await self._ainvalidate_keys(self._find_outdated(changes))
+
+    async def _ainvalidate_keys(self, keys):
+        self._root._state.discard_failures(keys)
+        executor = self._root._state.get_executor()
+        handlers = self._root._state.pop_close_handlers(keys)
+        with capture_exceptions() as capture:
+            for key, handler, resource in handlers:
+                instance = find_instance(self._root, key)
+                with capture():
+                    await as_async_in(
+                        executor, handler, instance, self._root, resource
+                    )
+            self._root._state.discard_resources(keys)
+
+    async def check_health(self, *, cascade=False, timeout=None):
+        makers = dict(_walk_makers(self._unfrozen_class))
+        results = await gather(*(
+            self._is_unhealthy(key, maker, timeout)
+            for key, maker in makers.items()
+        ))
+        unhealthy = [key for key, failed in zip(makers, results) if failed]
+        with capture_exceptions() as capture:
+            for key in unhealthy:
+                with capture():
+                    await self._ainvalidate_keys(
+                        self._find_invalidated(key, cascade)
+                    )
+                with capture():
+                    value = getattr(
+                        find_instance(self, key), key.rsplit('.', 1)[-1]
+                    )
+                    if isawaitable(value):
+                        await value
+        return unhealthy
+
+    async def _is_unhealthy(self, key, maker, timeout):
+        handler = getattr(maker, 'health_handler', None)
+        if handler is None or not self._state.has_resource(key):
+            return False
+        resource = self._state.get_resource(key)
+        if isinstance(resource, LazyProxy) and not is_created(resource):
+            return False
+        try:
+            healthy = await wait_for(as_async_in(
+                self._state.get_executor(), handler,
+                find_instance(self, key), self, resource
+            ), timeout)
+        except Exception:
+            healthy = False
+        if not healthy:
+            self._state.count(key, 'unhealthy')
+        return not healthy
+
+    def set_executor(self, executor=None):
+        self._state.set_executor(executor)
+
+    def set_deadline(self, deadline):
+        self._state.set_deadline(deadline)
 
     async def aclose(self):
+        pending = self._state.take_pending()
+        for task in pending:
+            task.cancel()
+        await gather(*pending, return_exceptions=True)
+        executor = self._state.get_executor()
         handlers = self._state.get_close_handlers()
         with capture_exceptions() as capture:
             for key, handler, resource in handlers:
                 instance = find_instance(self, key)
                 with capture():
-                    await as_async(handler, instance, self, resource)
+                    await as_async_in(
+                        executor, handler, instance, self, resource
+                    )
             self._state.clear_close_handlers()
+            pool = self._state.pop_process_pool()
+            if pool is not None:
+                await run_in_executor(None, pool.shutdown)
@@ -0,0 +1,167 @@
+from asyncio import gather
+from collections import namedtuple
+from inspect import Parameter, iscoroutine, signature
+
+from .exceptions import UnresolvedArgumentError
+from .utils import Undefined, make_if_none
+
+
+ROOT = 'root'
+PARAM = 'param'
+MEMBER = 'member'
+LOOKUP = 'lookup'
+
+
+Argument = namedtuple('Argument', ('name', 'source', 'default', 'keyword'))
+
+
+class ArgumentBinder:
+
+    __slots__ = ('_arguments', '_asynchronous', 'call')
+
+    def __init__(self, arguments, *, asynchronous=False):
+        self._arguments = tuple(arguments)
+        self._asynchronous = asynchronous and any(
+            a.source in (MEMBER, LOOKUP) for a in self._arguments
+        )
+        self.call = self._compile()
+
+    @classmethod
+    def from_args(cls, args, kwargs=None, defaults=None):
+        defaults = make_if_none(defaults, dict())
+        arguments = [
+            _make_argument(name, defaults.get(name), keyword)
+            for names, keyword in ((args, False), (kwargs or (), True))
+            for name in names
+        ]
+        return cls(arguments)
+
+    @classmethod
+    def from_signature(cls, func, members, *, asynchronous=False):
+        arguments = []
+        parameters = list(signature(func).parameters.values())[1:]
+        for parameter in parameters:
+            if parameter.kind in (Parameter.VAR_POSITIONAL,
+                                  Parameter.VAR_KEYWORD):
+                raise TypeError(
+                    'Cannot autowire variable argument `{name}`'.format(
+                        name=parameter.name
+                    )
+                )
+            arguments.append(Argument(
+                parameter.name,
+                _find_source(parameter.name, members),
+                _get_default(parameter),
+                parameter.kind == Parameter.KEYWORD_ONLY
+            ))
+        return cls(arguments, asynchronous=asynchronous)
+
+    @property
+    def arguments(self):
+        return self._arguments
+
+    def bind(self, instance, root, params, overrides):
+        args = []
+        kwargs = dict(overrides)
+        for argument in self._arguments:
+            if argument.name in kwargs:
+                value = kwargs.pop(argument.name)
+            else:
+                value = _resolve(argument, instance, root, params)
+            if argument.keyword:
+                kwargs[argument.name] = value
+            else:
+                args.append(value)
+        return args, kwargs
+
+    def _compile(self):
+        namespace = dict(_lookup=lookup, _gather=gather_awaitables)
+        names = []
+        lines = []
+        for i, argument in enumerate(self._arguments):
+            names.append('_{}'.format(i))
+            namespace['_default_{}'.format(i)] = argument.default
+            lines.append('    _{} = {}\n'.format(
+                i, _expression(i, argument)
+            ))
+        values = [
+            '{}={}'.format(a.name, n) if a.keyword else n
+            for n, a in zip(names, self._arguments)
+        ]
+        call = 'func(instance, {})'.format(', '.join(values))
+        if self._asynchronous:
+            header = 'async def call(func, instance, root, params):\n'
+            lines.append('    {}, = await _gather({})\n'.format(
+                ', '.join(names), ', '.join(names)
+            ))
+            call = 'await ' + call
+        else:
+            header = 'def call(func, instance, root, params):\n'
+        source = header + ''.join(lines) + '    return {}\n'.format(call)
+        exec(source, namespace)
+        return namespace['call']
+
+
+def lookup(root, params, name, default):
+    if name in root._member_names:
+        return getattr(root, name)
+    if name in params:
+        return params[name]
+    if default is Undefined:
+        raise UnresolvedArgumentError(
+            'Cannot resolve the argument `{name}`'.format(name=name)
+        )
+    return default
+
+
+async def gather_awaitables(*values):
+    if not any(map(iscoroutine, values)):
+        return values
+    return await gather(*(
+        v if iscoroutine(v) else _as_awaitable(v) for v in values
+    ))
+
+
+async def _as_awaitable(value):
+    return value
+
+
+def _make_argument(name, default, keyword):
+    source = ROOT if name == 'root' else PARAM
+    return Argument(name, source, default, keyword)
+
+
+def _find_source(name, members):
+    if name == 'root':
+        return ROOT
+    if name in members:
+        return MEMBER
+    return LOOKUP
+
+
+def _get_default(parameter):
+    if parameter.default is Parameter.empty:
+        return Undefined
+    return parameter.default
+
+
+def _resolve(argument, instance, root, params):
+    if argument.source == ROOT:
+        return root
+    if argument.source == MEMBER:
+        return getattr(instance, argument.name)
+    if argument.source == LOOKUP:
+        return lookup(root, params, argument.name, argument.default)
+    return params.get(argument.name, argument.default)
+
+
+def _expression(i, argument):
+    if argument.source == ROOT:
+        return 'root'
+    if argument.source == MEMBER:
+        return 'instance.{}'.format(argument.name)
+    if argument.source == LOOKUP:
+        return '_lookup(root, params, {!r}, _default_{})'.format(
+            argument.name, i
+        )
+    return 'params.get({!r}, _default_{})'.format(argument.name, i)
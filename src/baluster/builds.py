@@ -0,0 +1,68 @@
+from contextlib import contextmanager
+import os
+import pickle
+from tempfile import gettempdir
+
+from .disk import DiskCache
+
+try:
+    from fcntl import flock, LOCK_EX, LOCK_UN
+except ImportError:
+    flock = None
+
+
+class Unshared:
+    pass
+
+
+class SharedBuilds:
+
+    __slots__ = ('_cache', )
+
+    def __init__(self, directory):
+        if flock is None:
+            raise RuntimeError('Shared builds require fcntl')
+        self._cache = DiskCache(directory)
+
+    @property
+    def directory(self):
+        return self._cache.directory
+
+    def get_or_build(self, name, build):
+        found, value = self._cache.load(name)
+        if not found:
+            with self._lock(name):
+                found, value = self._cache.load(name)
+                if not found:
+                    value = build()
+                    self._store(name, value)
+                    return value
+        if value is Unshared:
+            return build()
+        return value
+
+    def _store(self, name, value):
+        try:
+            self._cache.store(name, value)
+        except (TypeError, AttributeError, pickle.PicklingError):
+            self._cache.store(name, Unshared)
+
+    @contextmanager
+    def _lock(self, name):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, name + '.lock')
+        with open(path, 'w') as f:
+            flock(f, LOCK_EX)
+            try:
+                yield
+            finally:
+                flock(f, LOCK_UN)
+
+
+def xdist_builds():
+    run = os.environ.get('PYTEST_XDIST_TESTRUNUID')
+    if run is None:
+        return None
+    return SharedBuilds(
+        os.path.join(gettempdir(), 'baluster-{}'.format(run))
+    )
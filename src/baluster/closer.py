@@ -0,0 +1,66 @@
+from asyncio import Queue, ensure_future, gather, get_event_loop
+
+from .exceptions import MultipleExceptions
+
+
+class BackgroundCloser:
+
+    __slots__ = ('_maxsize', '_workers', '_on_error', '_queue', '_tasks')
+
+    def __init__(self, *, maxsize=100, workers=1, on_error=None):
+        self._maxsize = maxsize
+        self._workers = workers
+        self._on_error = on_error
+        self._queue = None
+        self._tasks = []
+
+    @property
+    def pending(self):
+        if self._queue is None:
+            return 0
+        return self._queue.qsize()
+
+    async def submit(self, scope):
+        if self._queue is None:
+            self._queue = Queue(self._maxsize)
+        if not self._tasks:
+            self._tasks = [
+                ensure_future(self._work()) for _ in range(self._workers)
+            ]
+        await self._queue.put(scope)
+
+    async def drain(self):
+        if self._queue is None:
+            return
+        await self._queue.join()
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await gather(*tasks, return_exceptions=True)
+
+    async def _work(self):
+        while True:
+            scope = await self._queue.get()
+            try:
+                await scope.aclose()
+            except MultipleExceptions as ex:
+                for exception in ex.exceptions:
+                    self._report(scope, exception)
+            except Exception as ex:
+                self._report(scope, ex)
+            finally:
+                self._queue.task_done()
+
+    def _report(self, scope, exception):
+        message = 'Closing a scope in the background failed'
+        if self._on_error is not None:
+            try:
+                self._on_error(scope, exception)
+                return
+            except Exception as ex:
+                message = 'The error handler of the background closer failed'
+                exception = ex
+        get_event_loop().call_exception_handler({
+            'message': message,
+            'exception': exception,
+        })
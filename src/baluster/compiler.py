@@ -0,0 +1,87 @@
+ACCESSOR_TEMPLATE = '''
+class {name}_accessor:
+
+    __slots__ = ()
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return {name}_maker
+        resources = instance._root._state._resources
+        key = instance._name
+        key = {name!r} if key is None else key + {suffix!r}
+        if key in resources:
+            return resources[key]
+        return {name}_maker.__get__(instance, owner)
+
+    def __set__(self, instance, value):
+        {name}_maker.__set__(instance, value)
+
+    def __delete__(self, instance):
+        {name}_maker.__delete__(instance)
+'''
+
+NEW_TEMPLATE = '''
+def __new__(cls, *args, **kwargs):
+    if cls is not compiled_cls:
+        return generic_new(cls, *args, **kwargs)
+    return object_new(cls)
+'''
+
+INIT_TEMPLATE = '''
+def __init__(self, *args, **kwargs):
+    if self.__class__ is not compiled_cls:
+        return generic_init(self, *args, **kwargs)
+    base_init(self, *args, **kwargs)
+{body}'''
+
+
+def is_compiled(func):
+    return getattr(func, 'compiled', False)
+
+
+def compile_accessors(cls, makers):
+    namespace = dict()
+    source = []
+    for maker in makers:
+        namespace['{}_maker'.format(maker._name)] = maker
+        source.append(ACCESSOR_TEMPLATE.format(
+            name=maker._name, suffix='.' + maker._name
+        ))
+    _exec(cls, 'accessors', ''.join(source), namespace)
+    for maker in makers:
+        setattr(
+            cls, maker._name, namespace['{}_accessor'.format(maker._name)]()
+        )
+
+
+def compile_new(cls, generic_new):
+    namespace = dict(
+        compiled_cls=cls, generic_new=generic_new, object_new=object.__new__
+    )
+    _exec(cls, '__new__', NEW_TEMPLATE, namespace)
+    cls.__new__ = staticmethod(namespace['__new__'])
+
+
+def compile_init(cls, makers, base_init, generic_init):
+    namespace = dict(
+        compiled_cls=cls, base_init=base_init, generic_init=generic_init
+    )
+    body = []
+    for i, (name, nested) in enumerate(cls._nested):
+        namespace['nested_{}'.format(i)] = nested
+        body.append('    self.{} = nested_{}(_parent=self)\n'.format(name, i))
+    for i, maker in enumerate(makers):
+        namespace['maker_{}'.format(i)] = maker
+        body.append('    maker_{}.init(self)\n'.format(i))
+    _exec(cls, '__init__', INIT_TEMPLATE.format(body=''.join(body)), namespace)
+    cls.__init__ = namespace['__init__']
+
+
+def _exec(cls, what, source, namespace):
+    code = compile(
+        source, '<{} of {}>'.format(what, cls.__qualname__), 'exec'
+    )
+    exec(code, namespace)
+    for value in namespace.values():
+        if getattr(value, '__code__', None) is not None:
+            value.compiled = True
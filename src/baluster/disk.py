@@ -0,0 +1,100 @@
+from contextlib import suppress
+from hashlib import sha256
+from inspect import getsource
+import os
+import pickle
+import re
+from tempfile import mkstemp
+
+from .analysis import dependency_graph
+from .utils import find_instance
+
+
+DEFAULT_DIRECTORY = '.baluster_cache'
+
+
+class DiskCache:
+
+    __slots__ = ('_directory', )
+
+    def __init__(self, directory=DEFAULT_DIRECTORY):
+        self._directory = directory
+
+    @property
+    def directory(self):
+        return self._directory
+
+    def load(self, name):
+        path = self._path(name)
+        try:
+            f = open(path, 'rb')
+        except OSError:
+            return False, None
+        with f:
+            try:
+                return True, pickle.load(f)
+            except Exception:
+                # Truncated, corrupt or refers to code that changed since
+                pass
+        with suppress(OSError):
+            os.unlink(path)
+        return False, None
+
+    def store(self, name, value):
+        os.makedirs(self._directory, exist_ok=True)
+        fd, path = mkstemp(dir=self._directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(value, f)
+            os.replace(path, self._path(name))
+        except BaseException:
+            os.unlink(path)
+            raise
+
+    def _path(self, name):
+        return os.path.join(self._directory, name + '.pickle')
+
+
+def cache_name(cls, key, params):
+    graph = dependency_graph(cls)
+    keys = sorted(k for level in graph.levels(key) for k in level)
+    check_derived(cls, key, graph, keys)
+    digest = sha256()
+    for name in keys:
+        digest.update(name.encode())
+        digest.update(source_hash(find_maker(cls, name)))
+    names = sorted(set().union(*map(graph.params_of, keys)))
+    digest.update(pickle.dumps(
+        [(n, n in params, params.get(n)) for n in names]
+    ))
+    func = find_maker(cls, key)._func
+    qualname = re.sub(
+        r'[^\w.]', '_', '{}.{}'.format(func.__module__, func.__qualname__)
+    )
+    return '{}-{}'.format(qualname, digest.hexdigest())
+
+
+def check_derived(cls, key, graph, keys):
+    unresolved = graph.unresolved
+    for name in keys:
+        func = getattr(find_maker(cls, name), '_func', None)
+        if func is None or name in unresolved:
+            raise TypeError(
+                'Cannot cache `{key}` by its params, `{name}` is not derived '
+                'from params only'.format(key=key, name=name)
+            )
+
+
+def source_hash(maker):
+    func = getattr(maker, '_func', None)
+    if func is None:
+        return b''
+    try:
+        source = getsource(func).encode()
+    except (OSError, TypeError):
+        source = func.__code__.co_code
+    return sha256(source).digest()
+
+
+def find_maker(cls, key):
+    return getattr(find_instance(cls, key), key.split('.')[-1])
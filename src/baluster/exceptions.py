@@ -11,3 +11,15 @@ class MultipleExceptions(Exception):
 
 class ContextManagerReusedError(Exception):
     pass
+
+
+class NoCurrentScopeError(LookupError):
+    pass
+
+
+class UnresolvedArgumentError(LookupError):
+    pass
+
+
+class FrozenError(AttributeError):
+    pass
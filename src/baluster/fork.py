@@ -0,0 +1,18 @@
+import os
+from weakref import WeakSet
+
+
+_states = WeakSet()
+
+
+def track(state):
+    _states.add(state)
+
+
+def reset_after_fork():
+    for state in list(_states):
+        state.reset_after_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=reset_after_fork)
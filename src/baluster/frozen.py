@@ -0,0 +1,98 @@
+from inspect import isfunction
+
+from .exceptions import FrozenError
+from .makers import AsyncFactoryMaker, FactoryMaker, KeyedFactoryMaker
+from .utils import get_member_name
+
+
+class FrozenBaluster:
+
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise FrozenError(
+            'Cannot set `{name}`, the root is frozen'.format(name=name)
+        )
+
+    def __delattr__(self, name):
+        raise FrozenError(
+            'Cannot delete `{name}`, the root is frozen'.format(name=name)
+        )
+
+    def __setitem__(self, name, value):
+        raise FrozenError('The root is frozen')
+
+    def __delitem__(self, name):
+        raise FrozenError('The root is frozen')
+
+    def _find_invalidated(self, name, cascade):
+        raise FrozenError('The root is frozen')
+
+    def _find_outdated(self, changes):
+        raise FrozenError('The root is frozen')
+
+
+class FrozenMember:
+
+    __slots__ = ('_key', )
+
+    def __init__(self, key):
+        self._key = key
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        raise FrozenError(
+            'The value `{key}` was not resolved before freezing'.format(
+                key=self._key
+            )
+        )
+
+
+class Resolved:
+
+    __slots__ = ('_value', )
+
+    def __init__(self, value):
+        self._value = value
+
+    def __await__(self):
+        return self._value
+        yield
+
+
+def freeze(instance):
+    for name, nested in instance._nested:
+        freeze(getattr(instance, name))
+    cls = instance.__class__
+    members = {
+        name: member for name, member in vars(FrozenBaluster).items()
+        if isfunction(member)
+    }
+    members['_unfrozen_class'] = cls
+    for maker in cls._makers:
+        if not _is_state_backed(instance, maker):
+            members[maker._name] = _frozen_member(instance, maker)
+    instance.__class__ = type(cls)(cls.__name__, (cls, ), members)
+
+
+def _is_state_backed(instance, maker):
+    if isinstance(maker, KeyedFactoryMaker):
+        return False
+    if isinstance(maker, FactoryMaker) and not maker._cache:
+        return True
+    key = get_member_name(instance._name, maker._name)
+    return instance._root._state.is_fork_unsafe(key)
+
+
+def _frozen_member(instance, maker):
+    key = get_member_name(instance._name, maker._name)
+    state = instance._root._state
+    if isinstance(maker, KeyedFactoryMaker) or not state.has_resource(key):
+        return FrozenMember(key)
+    if isinstance(maker, AsyncFactoryMaker):
+        return Resolved(state.get_resource(key))
+    value = getattr(instance, maker._name)
+    if hasattr(type(value), '__get__'):
+        return staticmethod(value)
+    return value
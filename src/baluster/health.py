@@ -0,0 +1,71 @@
+from asyncio import ensure_future, gather, get_event_loop, sleep
+
+from .exceptions import MultipleExceptions
+
+
+class HealthChecker:
+
+    __slots__ = (
+        '_root', '_interval', '_cascade', '_timeout', '_on_error', '_task'
+    )
+
+    def __init__(
+        self, root, *, interval=30, cascade=False, timeout=None, on_error=None
+    ):
+        self._root = root
+        self._interval = interval
+        self._cascade = cascade
+        self._timeout = timeout
+        self._on_error = on_error
+        self._task = None
+
+    @property
+    def running(self):
+        return self._task is not None
+
+    def start(self):
+        if self._task is None:
+            self._task = ensure_future(self._run())
+
+    async def stop(self):
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await gather(task, return_exceptions=True)
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.stop()
+
+    async def check(self):
+        try:
+            await self._root.check_health(
+                cascade=self._cascade, timeout=self._timeout
+            )
+        except MultipleExceptions as ex:
+            for exception in ex.exceptions:
+                self._report(exception)
+        except Exception as ex:
+            self._report(ex)
+
+    async def _run(self):
+        while True:
+            await sleep(self._interval)
+            await self.check()
+
+    def _report(self, exception):
+        message = 'Replacing an unhealthy resource failed'
+        if self._on_error is not None:
+            try:
+                self._on_error(self._root, exception)
+                return
+            except Exception as ex:
+                message = 'The error handler of the health checker failed'
+                exception = ex
+        get_event_loop().call_exception_handler({
+            'message': message,
+            'exception': exception,
+        })
@@ -0,0 +1,103 @@
+from asyncio import get_event_loop
+from collections import OrderedDict
+from threading import Lock
+
+from .utils import retrieve
+
+
+cache_lock = Lock()
+
+
+class KeyedCache:
+
+    __slots__ = (
+        '_owner', '_maxsize', '_items', '_pending', '_locks', '_lock', '_batch'
+    )
+
+    def __init__(self, owner, maxsize, items=None):
+        self._owner = owner
+        self._maxsize = maxsize
+        self._items = OrderedDict(items or ())
+        self._pending = dict()
+        self._locks = dict()
+        self._lock = Lock()
+        self._batch = []
+
+    @property
+    def owner(self):
+        return self._owner
+
+    def copy(self, owner):
+        return self.__class__(owner, self._maxsize, self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get(self, key):
+        self._items.move_to_end(key)
+        return self._items[key]
+
+    def set(self, key, value):
+        self._items[key] = value
+        self._items.move_to_end(key)
+        evicted = []
+        while self._maxsize is not None and len(self._items) > self._maxsize:
+            evicted.append(self._items.popitem(last=False)[1])
+        return evicted
+
+    def lock(self, key):
+        with self._lock:
+            return self._locks.setdefault(key, Lock())
+
+    def release(self, key):
+        with self._lock:
+            self._locks.pop(key, None)
+
+    @property
+    def batch(self):
+        return self._batch
+
+    def take_batch(self, batch):
+        if batch is self._batch:
+            self._batch = []
+        return batch
+
+    def get_pending(self, key):
+        return self._pending.get(key)
+
+    def add_pending(self, key):
+        future = self._pending[key] = get_event_loop().create_future()
+        future.add_done_callback(retrieve)
+        return future
+
+    def resolve_pending(self, key, value):
+        self._pending.pop(key).set_result(value)
+
+    def cancel_pending(self, pending):
+        for key, future in pending:
+            if self._pending.get(key) is future:
+                self._pending.pop(key).cancel()
+
+    def fail_pending(self, key, exception):
+        self._pending.pop(key).set_exception(exception)
+
+
+class KeyedAccessor:
+
+    __slots__ = ('_maker', '_mediator')
+
+    def __init__(self, maker, mediator):
+        self._maker = maker
+        self._mediator = mediator
+
+    def __getitem__(self, key):
+        return self._maker.get_item(self._mediator, key)
+
+    def __call__(self, key):
+        return self._maker.get_item(self._mediator, key)
+
+    def __setitem__(self, key, value):
+        self._maker.set_item(self._mediator, key, value)
+
+    def __contains__(self, key):
+        return self._maker.has_item(self._mediator, key)
@@ -1,6 +1,23 @@
+from asyncio import (
+    CancelledError, TimeoutError, current_task, ensure_future, gather,
+    get_event_loop, iscoroutinefunction, shield, sleep as async_sleep, wait
+)
+from collections.abc import Mapping
 from functools import partial
 
-from .utils import make_caller, async_partial, Undefined
+from .binding import ArgumentBinder, PARAM, gather_awaitables
+from .disk import DiskCache, cache_name
+from .exceptions import UnresolvedArgumentError
+from .keyed import KeyedAccessor, KeyedCache, cache_lock
+from .mapped import MappedFile, close_mapped
+from .process import call_in_process
+from .proxy import LazyProxy
+from .shared import SharedBuffer, SharedMemory, release
+from .utils import (
+    make_caller, as_async_in, async_partial,
+    capture_exceptions, find_instance, for_each, retrieve, run_in_executor,
+    Undefined
+)
 
 
 class BaseMaker:
@@ -16,6 +33,9 @@ class BaseMaker:
     def get_mediator(self, instance):
         return self._mediator_factory(self._name, instance)
 
+    def prepare(self, owner):
+        pass
+
     def init(self, instance):
         pass
 
@@ -57,39 +77,202 @@ class ValueMaker(BaseMaker):
         mediator.save(value)
 
 
+class MappedMaker(BaseMaker):
+
+    __slots__ = ('_param', )
+
+    def __init__(self, param):
+        self._name = None
+        self._param = param
+
+    @property
+    def param(self):
+        return self._param
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        mediator = self.get_mediator(instance)
+        params = mediator.params
+        if self._param not in params:
+            raise UnresolvedArgumentError(
+                'Cannot resolve the argument `{name}`'.format(
+                    name=self._param
+                )
+            )
+        return self._get_mapped(mediator).get(params[self._param])
+
+    def __set__(self, instance, value):
+        raise AttributeError(
+            'The value `{name}` is readonly'.format(name=self._name)
+        )
+
+    def _get_mapped(self, mediator):
+        if mediator.has():
+            return mediator.get()
+        mapped = MappedFile(partial(mediator.add_close_handler, close_mapped))
+        mediator.save(mapped)
+        return mapped
+
+
 class FactoryMaker(BaseMaker):
 
     __slots__ = (
         '_cache', '_readonly', '_inject', '_close_handler',
-        '_invalidate_after_closed', '_args', '_func'
+        '_invalidate_after_closed', '_health_handler', '_args', '_kwargs',
+        '_defaults',
+        '_autowire', '_lazy', '_fork_safe', '_retry', '_failure_ttl',
+        '_share_build', '_thread_local', '_binder', '_batch_func', '_func'
     )
 
+    _asynchronous = False
+    _default_args = ('root', )
+
     def __init__(
-        self, func=None, *, cache=True, readonly=False, inject=None, args=None
+        self, func=None, *, cache=True, readonly=False, inject=None,
+        args=None, kwargs=None, defaults=None, autowire=False, lazy=False,
+        fork_safe=True, retry=None, failure_ttl=None, share_build=False,
+        thread_local=False
     ):
+        if lazy and self._asynchronous:
+            raise TypeError('Async factories cannot be lazy')
+        if share_build and not cache:
+            raise TypeError('Uncached factories cannot share builds')
         self._cache = cache
         self._readonly = readonly
         self._inject = inject
         self._close_handler = None
+        self._health_handler = None
         self._invalidate_after_closed = False
-        self._args = args or ['root']
+        self._args = args or list(self._default_args)
+        self._kwargs = kwargs
+        self._defaults = defaults
+        self._autowire = autowire
+        self._lazy = lazy
+        self._fork_safe = fork_safe
+        self._retry = retry
+        self._failure_ttl = failure_ttl
+        self._share_build = share_build
+        self._thread_local = thread_local
+        self._binder = None
+        self._batch_func = None
         self._func = func
 
+    def prepare(self, owner):
+        super().prepare(owner)
+        self._binder = self._make_binder(owner)
+
+    def _make_binder(self, owner):
+        if not self._autowire:
+            return ArgumentBinder.from_args(
+                self._args, self._kwargs, self._defaults
+            )
+        members = {
+            name for name in dir(owner)
+            if isinstance(getattr(owner, name, None), BaseMaker)
+        }
+        return ArgumentBinder.from_signature(
+            self._func, members, asynchronous=self._asynchronous
+        )
+
+    @property
+    def arguments(self):
+        return self._binder.arguments
+
     def __get__(self, instance, owner):
         if instance is None:
             return self
-        return self._get(self.get_mediator(instance))
+        return self._get(self._resolve_mediator(instance))
+
+    def _resolve_mediator(self, instance):
+        mediator = self.get_mediator(instance)
+        if self._thread_local or not self._cache:
+            return mediator
+        while not self._is_owned(mediator):
+            origin = mediator.root._thread_origin
+            if origin is None:
+                break
+            mediator = self.get_mediator(find_instance(origin, mediator.key))
+        return mediator
+
+    def _is_owned(self, mediator):
+        return mediator.has()
 
     def _get(self, mediator):
         if mediator.has():
             return mediator.get()
-        value = self._get_func(mediator)
+        if self._lazy:
+            return self._get_proxy(mediator)
+        return self._create(mediator)
+
+    def _get_proxy(self, mediator):
+        proxy = LazyProxy(partial(self._create, mediator))
+        self._track(mediator)
+        if self._cache:
+            mediator.save(proxy)
+        return proxy
+
+    def _create(self, mediator):
+        builds = None
+        if self._share_build:
+            builds = mediator.state.get_shared_builds()
+        if builds is None:
+            value = self._call(mediator)
+        else:
+            value = builds.get_or_build(
+                cache_name(
+                    mediator.root.__class__, mediator.key, mediator.params
+                ),
+                partial(self._call, mediator)
+            )
         return self._process_value(mediator, value)
 
+    def _call(self, mediator):
+        if self._retry is None and self._failure_ttl is None:
+            return self._get_func(mediator)
+        return self._retrying(mediator, partial(self._get_func, mediator))
+
+    def _retrying(self, mediator, call, item=Undefined):
+        self._check_failure(mediator, item)
+        attempt = 0
+        while True:
+            mediator.count('attempts')
+            try:
+                return call()
+            except Exception as ex:
+                delay = self._find_delay(mediator, attempt, ex, item)
+            self._retry.sleep(delay)
+            attempt += 1
+
+    def _check_failure(self, mediator, item):
+        failure = mediator.get_failure(item)
+        if failure is not None:
+            mediator.count('fast_failures')
+            raise failure.with_traceback(None)
+
+    def _find_delay(self, mediator, attempt, exception, item):
+        delay = None
+        if self._retry is not None:
+            delay = self._retry.delay(attempt, exception)
+        if delay is None:
+            mediator.count('failures')
+            if self._failure_ttl is not None:
+                mediator.add_failure(exception, self._failure_ttl, item)
+            raise exception
+        mediator.count('retries')
+        return delay
+
     def _get_func(self, mediator):
-        return self._func(*mediator.get_args(self._args))
+        return self._binder.call(
+            self._func, mediator.instance, mediator.root, mediator.params
+        )
+
+    def _track(self, mediator):
+        if not self._fork_safe:
+            mediator.mark_fork_unsafe()
 
     def _process_value(self, mediator, value):
+        self._track(mediator)
         if self._invalidate_after_closed:
             mediator.add_close_handler(make_caller(mediator.invalidate))
         if self._close_handler:
@@ -123,6 +306,39 @@ class FactoryMaker(BaseMaker):
             return inner
         return inner(handler)
 
+    def health(self, handler):
+        self._health_handler = handler
+        return handler
+
+    @property
+    def health_handler(self):
+        return self._health_handler
+
+    def batch(self, func):
+        self._batch_func = func
+        return func
+
+    def build_many(self, mediator, count, overrides):
+        args, kwargs = self._bind(mediator, overrides)
+        instance = mediator.instance
+        if self._batch_func is not None:
+            values = self._batch_func(instance, *args, count, **kwargs)
+        else:
+            values = [self._func(instance, *args, **kwargs)
+                      for _ in range(count)]
+        return self._process_values(mediator, list(values))
+
+    def _bind(self, mediator, overrides):
+        return self._binder.bind(
+            mediator.instance, mediator.root, mediator.params, overrides
+        )
+
+    def _process_values(self, mediator, values):
+        self._track(mediator)
+        if self._close_handler and values:
+            mediator.add_close_handler(for_each(self._close_handler), values)
+        return values
+
     def get_injectable(self, mediator):
         return partial(self._get, mediator)
 
@@ -134,20 +350,559 @@ class FactoryMaker(BaseMaker):
         mediator.set_inject(self._inject, self.get_injectable(mediator))
 
 
-class AsyncFactoryMaker(FactoryMaker):
+class AsyncCallMixin:
 
     __slots__ = ()
 
+    async def _retrying(self, mediator, call, item=Undefined):
+        self._check_failure(mediator, item)
+        attempt = 0
+        while True:
+            mediator.count('attempts')
+            try:
+                return await call()
+            except Exception as ex:
+                delay = self._find_delay(mediator, attempt, ex, item)
+            await async_sleep(delay)
+            attempt += 1
+
+    async def _wait_for(self, mediator, create, timeout):
+        if timeout > 0:
+            creation = ensure_future(create())
+            try:
+                done, _ = await wait((creation, ), timeout=timeout)
+            finally:
+                if not creation.done():
+                    creation.cancel()
+                    creation.add_done_callback(
+                        partial(self._discard, mediator)
+                    )
+            if done:
+                return creation.result()
+        raise TimeoutError(
+            'Creating `{name}` timed out'.format(name=self._name)
+        )
+
+    def _find_timeout(self, state):
+        deadline = state.get_deadline()
+        if deadline is None:
+            return self._timeout
+        remaining = max(deadline - get_event_loop().time(), 0)
+        if self._timeout is None:
+            return remaining
+        return min(self._timeout, remaining)
+
+    def _discard(self, mediator, creation):
+        if creation.cancelled() or creation.exception() is not None or \
+                self._close_handler is None:
+            return
+        executor = mediator.state.get_executor()
+        for resource in self._late_resources(creation.result()):
+            ensure_future(as_async_in(
+                executor, self._close_handler,
+                mediator.instance, mediator.root, resource
+            )).add_done_callback(retrieve)
+
+    def _late_resources(self, value):
+        return [value]
+
+
+class AsyncFactoryMaker(AsyncCallMixin, FactoryMaker):
+
+    __slots__ = ('_timeout', )
+
+    _asynchronous = True
+
+    def __init__(self, func=None, *, timeout=None, **kwargs):
+        if kwargs.get('share_build'):
+            raise TypeError('Async factories cannot share builds')
+        super().__init__(func, **kwargs)
+        self._timeout = timeout
+
     def __get__(self, instance, owner):
         if instance is None:
             return self
-        return self._get(self.get_mediator(instance))
+        return self._get(self._resolve_mediator(instance))
 
     async def _get(self, mediator):
         if mediator.has():
             return mediator.get()
-        value = await self._get_func(mediator)
+        if not self._cache:
+            return await self._create(mediator)
+        pending = mediator.get_pending() or self._start(mediator)
+        return await shield(pending)
+
+    def _start(self, mediator):
+        task = ensure_future(self._create_pending(mediator))
+        task.add_done_callback(retrieve)
+        mediator.add_pending(task)
+        return task
+
+    async def _create_pending(self, mediator):
+        try:
+            return await self._create(mediator)
+        finally:
+            mediator.discard_pending(current_task())
+
+    async def _create(self, mediator):
+        value = await self._call(mediator)
         return self._process_value(mediator, value)
 
+    async def _call(self, mediator):
+        if self._retry is None and self._failure_ttl is None:
+            return await self._call_once(mediator)
+        return await self._retrying(
+            mediator, partial(self._call_once, mediator)
+        )
+
+    async def _call_once(self, mediator):
+        timeout = self._find_timeout(mediator.state)
+        if timeout is None:
+            return await self._get_func(mediator)
+        return await self._wait_for(
+            mediator, partial(self._get_func, mediator), timeout
+        )
+
+    def prefetch(self, mediator):
+        if mediator.has():
+            return None
+        return mediator.get_pending() or self._start(mediator)
+
+    async def build_many(self, mediator, count, overrides):
+        args, kwargs = self._bind(mediator, overrides)
+        args = await gather_awaitables(*args)
+        kwargs = dict(zip(
+            kwargs, await gather_awaitables(*kwargs.values())
+        ))
+        instance = mediator.instance
+        if self._batch_func is not None:
+            values = await self._batch_func(instance, *args, count, **kwargs)
+        else:
+            values = await gather(*(
+                self._func(instance, *args, **kwargs) for _ in range(count)
+            ))
+        return self._process_values(mediator, list(values))
+
     def get_injectable(self, mediator):
         return async_partial(self._get, mediator)
+
+
+class ExecutorFactoryMaker(AsyncFactoryMaker):
+
+    __slots__ = ('_executor', )
+
+    _asynchronous = False
+
+    def __init__(self, func=None, *, executor=True, **kwargs):
+        if kwargs.get('lazy'):
+            raise TypeError('Factories run in an executor cannot be lazy')
+        super().__init__(func, **kwargs)
+        self._executor = executor
+
+    async def _get_func(self, mediator):
+        return await self._detach(mediator, run_in_executor(
+            self._find_executor(mediator.state),
+            super(AsyncFactoryMaker, self)._get_func, mediator
+        ))
+
+    async def _detach(self, mediator, future):
+        # The worker cannot be stopped, a value produced after the caller
+        # gave up is closed
+        try:
+            return await shield(future)
+        except CancelledError:
+            future.add_done_callback(partial(self._discard, mediator))
+            raise
+
+    async def build_many(self, mediator, count, overrides):
+        return await run_in_executor(
+            self._find_executor(mediator.state),
+            super(AsyncFactoryMaker, self).build_many,
+            mediator, count, overrides
+        )
+
+    def close(self, handler=None, *, invalidate=False):
+        def inner(f):
+            super(ExecutorFactoryMaker, self).close(
+                self._offload(f), invalidate=invalidate
+            )
+            return f
+        if handler is None:
+            return inner
+        return inner(handler)
+
+    def health(self, handler):
+        super().health(self._offload(handler))
+        return handler
+
+    def _offload(self, handler):
+        if iscoroutinefunction(handler):
+            return handler
+
+        async def offloaded(instance, root, resource):
+            return await run_in_executor(
+                self._find_executor(root._state),
+                handler, instance, root, resource
+            )
+        return offloaded
+
+    def _find_executor(self, state):
+        if self._executor is not True:
+            return self._executor
+        executor = state.get_executor()
+        if executor is Undefined:
+            return None
+        return executor
+
+
+class ProcessFactoryMaker(ExecutorFactoryMaker):
+
+    __slots__ = ()
+
+    _default_args = ()
+
+    def __init__(self, func=None, *, executor='process', **kwargs):
+        super().__init__(func, executor=executor, **kwargs)
+
+    def prepare(self, owner):
+        super().prepare(owner)
+        if any(a.source != PARAM for a in self._binder.arguments):
+            raise TypeError(
+                'The factory `{name}` runs in a process, '
+                'it can receive params only'.format(name=self._name)
+            )
+
+    async def _get_func(self, mediator):
+        args, kwargs = self._binder.bind(None, None, mediator.params, {})
+        return await self._detach(mediator, run_in_executor(
+            self._find_executor(mediator.state), call_in_process,
+            self._func.__module__, self._func.__qualname__, args, kwargs
+        ))
+
+    async def build_many(self, mediator, count, overrides):
+        args, kwargs = self._binder.bind(
+            None, None, mediator.params, overrides
+        )
+        executor = self._find_executor(mediator.state)
+        if self._batch_func is not None:
+            func, args = self._batch_func, args + [count]
+            values = await run_in_executor(
+                executor, call_in_process,
+                func.__module__, func.__qualname__, args, kwargs
+            )
+        else:
+            values = await gather(*(run_in_executor(
+                executor, call_in_process,
+                self._func.__module__, self._func.__qualname__, args, kwargs
+            ) for _ in range(count)))
+        return self._process_values(mediator, list(values))
+
+    def _offload(self, handler):
+        return handler
+
+    def _find_executor(self, state):
+        if self._executor == 'process':
+            return state.get_process_pool()
+        return self._executor
+
+
+class DiskCachedFactoryMaker(FactoryMaker):
+
+    __slots__ = ('_disk_cache', )
+
+    def __init__(self, func=None, *, disk_cache=True, **kwargs):
+        super().__init__(func, **kwargs)
+        if disk_cache is True:
+            self._disk_cache = DiskCache()
+        else:
+            self._disk_cache = DiskCache(disk_cache)
+
+    def _get_func(self, mediator):
+        name = cache_name(
+            mediator.root.__class__, mediator.key, mediator.params
+        )
+        found, value = self._disk_cache.load(name)
+        if not found:
+            value = super()._get_func(mediator)
+            self._disk_cache.store(name, value)
+        return value
+
+
+class SharedFactoryMaker(FactoryMaker):
+
+    __slots__ = ()
+
+    def __init__(self, func=None, **kwargs):
+        if SharedMemory is None:
+            raise RuntimeError(
+                'Shared factories require multiprocessing.shared_memory, '
+                'available from Python 3.8'
+            )
+        super().__init__(func, **kwargs)
+
+    def _process_value(self, mediator, value):
+        buffer = SharedBuffer.create(value)
+        mediator.add_close_handler(release, buffer)
+        return super()._process_value(mediator, buffer)
+
+
+class KeyedFactoryMaker(FactoryMaker):
+
+    __slots__ = ('_maxsize', )
+
+    def __init__(self, func=None, *, maxsize=128, **kwargs):
+        if kwargs.get('autowire'):
+            raise TypeError('Keyed factories cannot be autowired')
+        if kwargs.get('share_build'):
+            raise TypeError('Keyed factories cannot share builds')
+        super().__init__(func, **kwargs)
+        self._maxsize = maxsize
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return KeyedAccessor(self, self._resolve_mediator(instance))
+
+    def __set__(self, instance, value):
+        raise AttributeError(
+            'The value `{name}` is keyed, set the items instead'.format(
+                name=self._name
+            )
+        )
+
+    def health(self, handler):
+        raise TypeError('Keyed factories cannot have health checks')
+
+    def get_cache(self, mediator):
+        cache = self._find_cache(mediator)
+        if cache is not None:
+            return cache
+        with cache_lock:
+            cache = self._find_cache(mediator)
+            if cache is None:
+                cache = self._make_cache(mediator)
+                self._track(mediator)
+                mediator.save(cache)
+            return cache
+
+    def _is_owned(self, mediator):
+        return self._find_cache(mediator) is not None
+
+    def _find_cache(self, mediator):
+        if mediator.has():
+            cache = mediator.get()
+            if cache.owner is mediator.state:
+                return cache
+        return None
+
+    def _make_cache(self, mediator):
+        if mediator.has():
+            return mediator.get().copy(mediator.state)
+        return KeyedCache(mediator.state, self._maxsize)
+
+    def has_item(self, mediator, key):
+        return mediator.has() and key in mediator.get()
+
+    def get_item(self, mediator, key):
+        cache = self.get_cache(mediator)
+        if key in cache:
+            return cache.get(key)
+        with cache.lock(key):
+            try:
+                if key in cache:
+                    return cache.get(key)
+                value = self._call_item(mediator, key)
+                evicted = self._process_item(mediator, cache, key, value)
+            finally:
+                cache.release(key)
+        self._close_evicted(mediator, evicted)
+        return value
+
+    def set_item(self, mediator, key, value):
+        cache = self.get_cache(mediator)
+        if key in cache:
+            raise AttributeError(
+                'The value `{name}[{key!r}]` has already been set'.format(
+                    name=self._name, key=key
+                )
+            )
+        if self._readonly:
+            raise AttributeError(
+                'The value `{name}` is readonly'.format(
+                    name=self._name
+                )
+            )
+        cache.set(key, value)
+
+    def _call_item(self, mediator, key):
+        if self._retry is None and self._failure_ttl is None:
+            return self._get_item_func(mediator, key)
+        return self._retrying(
+            mediator, partial(self._get_item_func, mediator, key), key
+        )
+
+    def _get_item_func(self, mediator, key):
+        func = self._func
+
+        def call(instance, *args, **kwargs):
+            return func(instance, *args, key, **kwargs)
+
+        return self._binder.call(
+            call, mediator.instance, mediator.root, mediator.params
+        )
+
+    def _process_item(self, mediator, cache, key, value):
+        if self._close_handler:
+            mediator.add_close_handler(self._close_handler, value)
+        return cache.set(key, value)
+
+    def _close_evicted(self, mediator, evicted):
+        if not evicted:
+            return
+        with capture_exceptions() as capture:
+            for handler, resource in mediator.pop_close_handlers(evicted):
+                with capture():
+                    handler(mediator.instance, mediator.root, resource)
+
+    def get_injectable(self, mediator):
+        return partial(KeyedAccessor, self, mediator)
+
+
+class AsyncKeyedFactoryMaker(AsyncCallMixin, KeyedFactoryMaker):
+
+    __slots__ = ('_timeout', )
+
+    def __init__(self, func=None, *, timeout=None, **kwargs):
+        super().__init__(func, **kwargs)
+        self._timeout = timeout
+
+    async def get_item(self, mediator, key):
+        cache = self.get_cache(mediator)
+        if key in cache:
+            return cache.get(key)
+        pending = mediator.get_pending(key) or \
+            self._start_item(mediator, cache, key)
+        return await shield(pending)
+
+    def _start_item(self, mediator, cache, key):
+        task = ensure_future(self._create_item(mediator, cache, key))
+        task.add_done_callback(retrieve)
+        mediator.add_pending(task, key)
+        return task
+
+    async def _create_item(self, mediator, cache, key):
+        try:
+            value = await self._call_item(mediator, key)
+            evicted = self._process_item(mediator, cache, key, value)
+        finally:
+            mediator.discard_pending(current_task(), key)
+        await self._close_evicted(mediator, evicted)
+        return value
+
+    async def _call_item(self, mediator, key):
+        if self._retry is None and self._failure_ttl is None:
+            return await self._call_item_once(mediator, key)
+        return await self._retrying(
+            mediator, partial(self._call_item_once, mediator, key), key
+        )
+
+    async def _call_item_once(self, mediator, key):
+        timeout = self._find_timeout(mediator.state)
+        if timeout is None:
+            return await self._get_item_func(mediator, key)
+        return await self._wait_for(
+            mediator, partial(self._get_item_func, mediator, key), timeout
+        )
+
+    async def _close_evicted(self, mediator, evicted):
+        if not evicted:
+            return
+        executor = mediator.state.get_executor()
+        with capture_exceptions() as capture:
+            for handler, resource in mediator.pop_close_handlers(evicted):
+                with capture():
+                    await as_async_in(
+                        executor, handler,
+                        mediator.instance, mediator.root, resource
+                    )
+
+
+class BatchFactoryMaker(AsyncKeyedFactoryMaker):
+
+    __slots__ = ('_max_batch', )
+
+    def __init__(self, func=None, *, max_batch=None, **kwargs):
+        if kwargs.get('failure_ttl') is not None:
+            raise TypeError('Batched factories cannot cache failures')
+        super().__init__(func, **kwargs)
+        self._max_batch = max_batch
+
+    async def get_item(self, mediator, key):
+        cache = self.get_cache(mediator)
+        if key in cache:
+            return cache.get(key)
+        pending = cache.get_pending(key)
+        if pending is None:
+            pending = cache.add_pending(key)
+            self._schedule(mediator, cache, key)
+        return await shield(pending)
+
+    def _schedule(self, mediator, cache, key):
+        batch = cache.batch
+        if not batch:
+            get_event_loop().call_soon(self._dispatch, mediator, cache, batch)
+        batch.append(key)
+        if self._max_batch is not None and len(batch) >= self._max_batch:
+            cache.take_batch(batch)
+
+    def _dispatch(self, mediator, cache, batch):
+        keys = cache.take_batch(batch)
+        futures = [cache.get_pending(key) for key in keys]
+        task = ensure_future(self._load(mediator, cache, keys))
+        task.add_done_callback(
+            lambda t: cache.cancel_pending(zip(keys, futures))
+        )
+
+    async def _load(self, mediator, cache, keys):
+        try:
+            values = await self._call_batch(mediator, keys)
+            values = self._match(keys, values)
+        except Exception as ex:
+            for key in keys:
+                cache.fail_pending(key, ex)
+            return
+        evicted = []
+        for key in keys:
+            if key in values:
+                evicted += self._process_item(
+                    mediator, cache, key, values[key]
+                )
+                cache.resolve_pending(key, values[key])
+            else:
+                cache.fail_pending(key, KeyError(key))
+        await self._close_evicted(mediator, evicted)
+
+    async def _call_batch(self, mediator, keys):
+        if self._retry is None:
+            return await self._call_item_once(mediator, keys)
+        return await self._retrying(
+            mediator, partial(self._call_item_once, mediator, keys)
+        )
+
+    def _late_resources(self, values):
+        if isinstance(values, Mapping):
+            return values.values()
+        return values
+
+    def _match(self, keys, values):
+        if isinstance(values, Mapping):
+            return values
+        values = list(values)
+        if len(values) != len(keys):
+            raise ValueError(
+                'The batch `{name}` returned {count} values '
+                'for {expected} keys'.format(
+                    name=self._name, count=len(values), expected=len(keys)
+                )
+            )
+        return dict(zip(keys, values))
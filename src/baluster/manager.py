@@ -1,31 +1,82 @@
+from asyncio import gather, get_event_loop
+
 from .exceptions import ContextManagerReusedError
+from .scope import publish_scope, unpublish_scope
 
 
 class Manager:
 
-    __slots__ = ('_managed', '_active')
+    __slots__ = ('_managed', '_active', '_publish', '_token')
 
-    def __init__(self, managed):
+    def __init__(self, managed, *, publish=False):
         self._managed = managed
         self._active = False
+        self._publish = publish
+        self._token = None
 
     def __enter__(self):
+        self._activate()
+        return self._managed
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            self._managed.close()
+        finally:
+            self._deactivate()
+
+    def _activate(self):
         if self._active is True:
             raise ContextManagerReusedError()
         self._active = True
-        return self._managed
+        if self._publish:
+            self._token = publish_scope(self._managed)
 
-    def __exit__(self, exc_type, exc_value, traceback):
+    def _deactivate(self):
         self._active = False
-        self._managed.close()
+        if self._token is not None:
+            unpublish_scope(self._token)
+            self._token = None
 
 
 class AsyncManager(Manager):
 
-    __slots__ = ()
+    __slots__ = ('_prefetch', '_tasks', '_closer', '_timeout')
+
+    def __init__(
+        self, managed, *, publish=False, prefetch=(), closer=None,
+        timeout=None
+    ):
+        super().__init__(managed, publish=publish)
+        self._prefetch = prefetch
+        self._tasks = []
+        self._closer = closer
+        self._timeout = timeout
 
     async def __aenter__(self):
+        self._activate()
+        try:
+            if self._timeout is not None:
+                self._managed.set_deadline(
+                    get_event_loop().time() + self._timeout
+                )
+            self._tasks = self._managed.prefetch(*self._prefetch)
+        except BaseException:
+            self._deactivate()
+            raise
         return self._managed
 
     async def __aexit__(self, exc_type, exc_value, traceback):
-        await self._managed.aclose()
+        try:
+            await self._cancel_prefetch()
+            if self._closer is not None:
+                await self._closer.submit(self._managed)
+            else:
+                await self._managed.aclose()
+        finally:
+            self._deactivate()
+
+    async def _cancel_prefetch(self):
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await gather(*tasks, return_exceptions=True)
@@ -0,0 +1,35 @@
+from mmap import mmap, ACCESS_READ
+from threading import Lock
+
+
+class MappedFile:
+
+    __slots__ = ('_lock', '_map', '_on_open')
+
+    def __init__(self, on_open):
+        self._lock = Lock()
+        self._map = None
+        self._on_open = on_open
+
+    @property
+    def opened(self):
+        return self._map is not None
+
+    def get(self, path):
+        if self._map is None:
+            with self._lock:
+                if self._map is None:
+                    with open(path, 'rb') as f:
+                        self._map = mmap(f.fileno(), 0, access=ACCESS_READ)
+                    self._on_open(self)
+        return self._map
+
+    def close(self):
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+
+
+def close_mapped(instance, root, mapped):
+    mapped.close()
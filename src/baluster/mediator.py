@@ -1,4 +1,5 @@
-from .utils import get_member_name
+from .analysis import dependency_graph
+from .utils import get_member_name, Undefined
 
 
 class Mediator:
@@ -21,6 +22,14 @@ class Mediator:
     def instance(self):
         return self._instance
 
+    @property
+    def key(self):
+        return self._key
+
+    @property
+    def state(self):
+        return self._state
+
     def get(self):
         return self._state.get_resource(self._key)
 
@@ -33,14 +42,47 @@ class Mediator:
     def invalidate(self):
         self._state.del_resource(self._key)
 
+    def get_pending(self, item=Undefined):
+        return self._state.get_pending(self._item_key(item))
+
+    def add_pending(self, future, item=Undefined):
+        self._state.add_pending(self._item_key(item), future)
+
+    def discard_pending(self, future, item=Undefined):
+        self._state.discard_pending(self._item_key(item), future)
+
     def add_close_handler(self, handler, resource=None):
         return self._state.add_close_handler(self._key, handler, resource)
 
-    def get_args(self, args):
-        return (
-            (self.instance,) +
-            tuple(self.root._state.get_args(args, root=self._root))
+    def pop_close_handlers(self, resources):
+        return [
+            (handler, resource) for _, handler, resource in
+            self._state.pop_resource_close_handlers(self._key, resources)
+        ]
+
+    def get_failure(self, item=Undefined):
+        return self._state.get_failure(self._item_key(item))
+
+    def add_failure(self, exception, ttl, item=Undefined):
+        self._state.add_failure(self._item_key(item), exception, ttl)
+
+    def _item_key(self, item):
+        if item is Undefined:
+            return self._key
+        return (self._key, item)
+
+    def count(self, event):
+        self._state.count(self._key, event)
+
+    def mark_fork_unsafe(self):
+        graph = dependency_graph(self._root.__class__)
+        self._state.mark_fork_unsafe(
+            {self._key} | graph.dependents_of(self._key)
         )
 
+    @property
+    def params(self):
+        return self._state.get_params()
+
     def set_inject(self, name, injectable):
         self._state.set_inject(name, injectable)
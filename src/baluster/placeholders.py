@@ -1,13 +1,35 @@
-from .makers import ValueMaker, FactoryMaker, AsyncFactoryMaker
+from .makers import (
+    ValueMaker, MappedMaker, FactoryMaker, AsyncFactoryMaker,
+    KeyedFactoryMaker, AsyncKeyedFactoryMaker, BatchFactoryMaker,
+    ExecutorFactoryMaker, ProcessFactoryMaker, SharedFactoryMaker,
+    DiskCachedFactoryMaker
+)
 from asyncio import iscoroutinefunction
+from concurrent.futures import ProcessPoolExecutor
 
 
 def value(*args, **kwargs):
     return ValueMaker(*args, **kwargs)
 
 
+def mapped(param):
+    return MappedMaker(param)
+
+
 def factory(func=None, **kwargs):
     def inner(f):
+        executor = kwargs.get('executor')
+        if executor:
+            if iscoroutinefunction(f):
+                raise TypeError('Async factories cannot run in an executor')
+            if executor == 'process' or \
+                    isinstance(executor, ProcessPoolExecutor):
+                return ProcessFactoryMaker(f, **kwargs)
+            return ExecutorFactoryMaker(f, **kwargs)
+        if kwargs.get('disk_cache'):
+            if iscoroutinefunction(f):
+                raise TypeError('Async factories cannot be cached on disk')
+            return DiskCachedFactoryMaker(f, **kwargs)
         factory_maker = {
             True: AsyncFactoryMaker,
             False: FactoryMaker
@@ -16,3 +38,35 @@ def factory(func=None, **kwargs):
     if func is None:
         return inner
     return inner(func)
+
+
+def keyed(func=None, **kwargs):
+    def inner(f):
+        keyed_maker = {
+            True: AsyncKeyedFactoryMaker,
+            False: KeyedFactoryMaker
+        }[iscoroutinefunction(f)]
+        return keyed_maker(f, **kwargs)
+    if func is None:
+        return inner
+    return inner(func)
+
+
+def batched(func=None, **kwargs):
+    def inner(f):
+        if not iscoroutinefunction(f):
+            raise TypeError('Batched factories have to be async')
+        return BatchFactoryMaker(f, **kwargs)
+    if func is None:
+        return inner
+    return inner(func)
+
+
+def shared(func=None, **kwargs):
+    def inner(f):
+        if iscoroutinefunction(f):
+            raise TypeError('Shared factories cannot be async')
+        return SharedFactoryMaker(f, **kwargs)
+    if func is None:
+        return inner
+    return inner(func)
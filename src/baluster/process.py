@@ -0,0 +1,9 @@
+from importlib import import_module
+
+
+def call_in_process(module, qualname, args, kwargs):
+    target = import_module(module)
+    for part in qualname.split('.'):
+        target = getattr(target, part)
+    func = getattr(target, '_func', target)
+    return func(None, *args, **kwargs)
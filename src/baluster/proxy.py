@@ -0,0 +1,76 @@
+from .utils import Undefined
+
+
+class LazyProxy:
+
+    __slots__ = ('_factory', '_target')
+
+    def __init__(self, factory):
+        object.__setattr__(self, '_factory', factory)
+        object.__setattr__(self, '_target', Undefined)
+
+    def _resolve(self):
+        target = object.__getattribute__(self, '_target')
+        if target is Undefined:
+            target = object.__getattribute__(self, '_factory')()
+            object.__setattr__(self, '_target', target)
+            object.__setattr__(self, '_factory', None)
+        return target
+
+    def __getattr__(self, name):
+        return getattr(self._resolve(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._resolve(), name, value)
+
+    def __delattr__(self, name):
+        delattr(self._resolve(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+    def __enter__(self):
+        return self._resolve().__enter__()
+
+    def __exit__(self, *args):
+        return self._resolve().__exit__(*args)
+
+    def __getitem__(self, key):
+        return self._resolve()[key]
+
+    def __setitem__(self, key, value):
+        self._resolve()[key] = value
+
+    def __delitem__(self, key):
+        del self._resolve()[key]
+
+    def __contains__(self, item):
+        return item in self._resolve()
+
+    def __iter__(self):
+        return iter(self._resolve())
+
+    def __len__(self):
+        return len(self._resolve())
+
+    def __bool__(self):
+        return bool(self._resolve())
+
+    def __eq__(self, other):
+        return self._resolve() == other
+
+    def __hash__(self):
+        return hash(self._resolve())
+
+    def __str__(self):
+        return str(self._resolve())
+
+    def __repr__(self):
+        target = object.__getattribute__(self, '_target')
+        if target is Undefined:
+            return '<LazyProxy (not created)>'
+        return '<LazyProxy {!r}>'.format(target)
+
+
+def is_created(proxy):
+    return object.__getattribute__(proxy, '_target') is not Undefined
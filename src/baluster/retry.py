@@ -0,0 +1,33 @@
+from random import uniform
+from time import sleep as time_sleep
+
+
+class Retry:
+
+    __slots__ = (
+        '_attempts', '_backoff', '_max_backoff', '_jitter', '_exceptions',
+        '_sleep'
+    )
+
+    def __init__(
+        self, attempts=3, *, backoff=0.1, max_backoff=10, jitter=0.1,
+        exceptions=(Exception, ), sleep=time_sleep
+    ):
+        if attempts < 1:
+            raise ValueError('At least one attempt is required')
+        self._attempts = attempts
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._jitter = jitter
+        self._exceptions = exceptions
+        self._sleep = sleep
+
+    def sleep(self, delay):
+        self._sleep(delay)
+
+    def delay(self, attempt, exception):
+        if attempt + 1 >= self._attempts or \
+                not isinstance(exception, self._exceptions):
+            return None
+        delay = min(self._backoff * 2 ** attempt, self._max_backoff)
+        return delay + uniform(0, delay * self._jitter)
@@ -0,0 +1,24 @@
+from contextvars import ContextVar
+
+from .exceptions import NoCurrentScopeError
+from .utils import Undefined
+
+
+_current_scope = ContextVar('baluster_current_scope')
+
+
+def current_scope(default=Undefined):
+    try:
+        return _current_scope.get()
+    except LookupError:
+        if default is Undefined:
+            raise NoCurrentScopeError()
+        return default
+
+
+def publish_scope(scope):
+    return _current_scope.set(scope)
+
+
+def unpublish_scope(token):
+    _current_scope.reset(token)
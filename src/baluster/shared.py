@@ -0,0 +1,65 @@
+from contextlib import suppress
+from os import getpid
+
+try:
+    from multiprocessing.shared_memory import SharedMemory
+except ImportError:
+    SharedMemory = None
+
+
+class SharedBuffer:
+
+    __slots__ = ('_memory', '_size', '_owner')
+
+    def __init__(self, memory, size, owner=None):
+        self._memory = memory
+        self._size = size
+        self._owner = owner
+
+    @classmethod
+    def create(cls, data):
+        view = memoryview(data).cast('B')
+        memory = SharedMemory(create=True, size=max(view.nbytes, 1))
+        memory.buf[:view.nbytes] = view
+        return cls(memory, view.nbytes, getpid())
+
+    @property
+    def name(self):
+        return self._memory.name
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def buf(self):
+        return self._memory.buf[:self._size].toreadonly()
+
+    def release(self):
+        if self._owner == getpid():
+            self._memory.unlink()
+            self._owner = None
+        with suppress(BufferError):
+            self._memory.close()
+
+    def __bytes__(self):
+        return bytes(self.buf)
+
+    def __len__(self):
+        return self._size
+
+    def __reduce__(self):
+        return attach, (self.name, self._size)
+
+    def __repr__(self):
+        return '<SharedBuffer {name} ({size} bytes)>'.format(
+            name=self.name, size=self._size
+        )
+
+
+def attach(name, size):
+    return SharedBuffer(SharedMemory(name), size)
+
+
+def release(instance, root, buffer):
+    buffer.release()
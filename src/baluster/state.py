@@ -1,49 +1,65 @@
-from collections import ChainMap
+from collections import ChainMap, Counter
+from concurrent.futures import ProcessPoolExecutor
+from time import monotonic
 
-from .utils import make_if_none, dict_partial_copy, make_caller, merge_dicts
+from .fork import track
+from .utils import (
+    make_if_none, dict_partial_copy, make_caller, merge_dicts, Undefined
+)
+
+
+class SharedState:
+
+    __slots__ = ('inject', 'process_pool', 'failures', 'stats', '__weakref__')
+
+    def __init__(self):
+        self.inject = dict()
+        self.process_pool = []
+        self.failures = dict()
+        self.stats = dict()
+
+    def reset_after_fork(self):
+        self.process_pool.clear()
 
 
 class InjectState:
 
-    def __init__(self, *, inject=None, **kwargs):
-        self._inject = make_if_none(inject, dict())
+    __slots__ = ()
 
     def set_inject(self, name, provider):
-        self._inject[name] = make_caller(provider)
+        self._shared.inject[name] = make_caller(provider)
 
     def map_inject_providers(self, function):
-        for args in self._inject.items():
+        for args in self._shared.inject.items():
             function(*args)
 
-    def new_child_data(self, **kwargs):
-        return dict(inject=self._inject)
-
 
 class DataState:
 
-    def __init__(self, *, data=None, **kwargs):
-        self._data = make_if_none(data, ChainMap(dict()))
+    __slots__ = ()
 
     def get_data(self, name):
         return self._data[name]
 
     def set_data(self, name, value):
-        self._data[name] = value
+        self._own_data()[name] = value
 
     def del_data(self, name):
-        del self._data[name]
+        del self._own_data()[name]
 
     def has_data(self, name):
         return name in self._data
 
-    def new_child_data(self, **kwargs):
-        return dict(data=self._data.new_child())
+    def _own_data(self):
+        if not self._owns_data:
+            self._data = self._data.new_child()
+            self._owns_data = True
+        return self._data
 
 
 class ResourceState:
 
-    def __init__(self, *, resources=None, **kwargs):
-        self._resources = make_if_none(resources, dict())
+    __slots__ = ()
 
     def get_resource(self, key):
         return self._resources[key]
@@ -57,10 +73,9 @@ class ResourceState:
     def del_resource(self, key):
         del self._resources[key]
 
-    def new_child_data(self, *, resources=None, **kwargs):
-        if resources is None:
-            resources = dict(self._resources)
-        return dict(resources=resources)
+    def discard_resources(self, keys):
+        for key in keys:
+            self._resources.pop(key, None)
 
     def filter_resources(self, patterns):
         return dict_partial_copy(self._resources, patterns)
@@ -68,8 +83,7 @@ class ResourceState:
 
 class CloseHandlersState:
 
-    def __init__(self, *, close_handlers=None, **kwargs):
-        self._close_handlers = make_if_none(close_handlers, [])
+    __slots__ = ()
 
     def add_close_handler(self, key, handler, resource):
         self._close_handlers.append((key, handler, resource))
@@ -80,37 +94,199 @@ class CloseHandlersState:
     def clear_close_handlers(self):
         self._close_handlers = []
 
-    def new_child_data(self, **kwargs):
-        return dict(close_handlers=[])
+    def pop_resource_close_handlers(self, key, resources):
+        popped = []
+        for resource in resources:
+            for i, (k, _, r) in enumerate(self._close_handlers):
+                if k == key and r is resource:
+                    popped.append(self._close_handlers.pop(i))
+                    break
+        return reversed(popped)
+
+    def pop_close_handlers(self, keys):
+        popped = [h for h in self._close_handlers if h[0] in keys]
+        self._close_handlers = [
+            h for h in self._close_handlers if h[0] not in keys
+        ]
+        return reversed(popped)
+
+
+class PendingState:
+
+    __slots__ = ()
+
+    def get_deadline(self):
+        return self._deadline
+
+    def set_deadline(self, deadline):
+        self._deadline = deadline
+
+    def get_pending(self, key):
+        return self._pending.get(key)
+
+    def add_pending(self, key, future):
+        self._pending[key] = future
+
+    def discard_pending(self, key, future):
+        if self._pending.get(key) is future:
+            del self._pending[key]
+
+    def take_pending(self):
+        pending, self._pending = list(self._pending.values()), dict()
+        return pending
+
+
+class ExecutorState:
+
+    __slots__ = ()
+
+    def get_executor(self):
+        return self._executor
+
+    def set_executor(self, executor):
+        self._executor = executor
+
+    def get_process_pool(self):
+        pool = self._shared.process_pool
+        if not pool:
+            pool.append(ProcessPoolExecutor())
+            track(self._shared)
+        return pool[0]
+
+    def pop_process_pool(self):
+        pool = self._shared.process_pool
+        if self._owns_process_pool and pool:
+            return pool.pop()
+        return None
+
+
+class ForkState:
+
+    __slots__ = ()
+
+    def mark_fork_unsafe(self, keys):
+        if not self._fork_unsafe:
+            track(self)
+        self._fork_unsafe.update(keys)
+
+    def is_fork_unsafe(self, key):
+        return key in self._fork_unsafe
+
+    def reset_after_fork(self):
+        keys = self._fork_unsafe
+        self.pop_close_handlers(keys)
+        self.discard_resources(keys)
+        self._pending = dict()
+        self._fork_unsafe = set()
+
+
+class SharedBuildsState:
+
+    __slots__ = ()
+
+    def get_shared_builds(self):
+        return self._shared_builds
+
+    def set_shared_builds(self, shared_builds):
+        self._shared_builds = shared_builds
+
+
+class FailureState:
+
+    __slots__ = ()
+
+    def get_failure(self, key):
+        failures = self._shared.failures
+        exception, expires = failures.get(key, (None, None))
+        if expires is not None and expires <= monotonic():
+            failures.pop(key, None)
+            return None
+        return exception
+
+    def add_failure(self, key, exception, ttl):
+        self._shared.failures[key] = (exception, monotonic() + ttl)
+
+    def failed_keys(self):
+        return {_failure_name(key) for key in self._shared.failures}
+
+    def discard_failures(self, keys):
+        failures = self._shared.failures
+        for key in [k for k in failures if _failure_name(k) in keys]:
+            del failures[key]
+
+    def count(self, key, event):
+        self._shared.stats.setdefault(key, Counter())[event] += 1
+
+    def get_stats(self):
+        return {
+            key: dict(counter) for key, counter in self._shared.stats.items()
+        }
+
+
+def _failure_name(key):
+    if isinstance(key, tuple):
+        return key[0]
+    return key
 
 
 class ParamsState:
 
-    def __init__(self, *, params=None, **kwargs):
-        self._params = make_if_none(params, dict())
+    __slots__ = ()
 
-    def get_args(self, names, **extra):
-        return [self._params.get(n) or extra.get(n) for n in names]
+    def get_params(self):
+        return self._params
 
-    def new_child_data(self, **kwargs):
-        return dict(params=self._params)
+    def update_params(self, changes):
+        self._params = merge_dicts([self._params, changes])
 
 
 mixtures = (
-    InjectState, DataState, ResourceState, CloseHandlersState, ParamsState
+    InjectState, DataState, ResourceState, CloseHandlersState, PendingState,
+    ExecutorState, ForkState, SharedBuildsState, FailureState, ParamsState
 )
 
 
 class State(*mixtures):
 
-    def __init__(self, **kwargs):
-        for mixture in mixtures:
-            mixture.__init__(self, **kwargs)
+    __slots__ = (
+        '_shared', '_data', '_owns_data', '_resources', '_close_handlers',
+        '_pending', '_deadline', '_executor', '_owns_process_pool',
+        '_fork_unsafe', '_shared_builds', '_params', '__weakref__'
+    )
+
+    def __init__(self, *, params=None):
+        self._shared = SharedState()
+        self._data = ChainMap(dict())
+        self._owns_data = True
+        self._resources = dict()
+        self._close_handlers = []
+        self._pending = dict()
+        self._deadline = None
+        self._executor = Undefined
+        self._owns_process_pool = True
+        self._fork_unsafe = set()
+        self._shared_builds = None
+        self._params = make_if_none(params, dict())
 
-    def new_child(self, **kwargs):
-        return self.__class__(**merge_dicts(
-            m.new_child_data(self, **kwargs) for m in mixtures
-        ))
+    def new_child(self, *, resources=None):
+        child = object.__new__(self.__class__)
+        child._shared = self._shared
+        child._data = self._own_data()
+        child._owns_data = False
+        if resources is None:
+            resources = dict(self._resources)
+        child._resources = resources
+        child._close_handlers = []
+        child._pending = dict()
+        child._deadline = self._deadline
+        child._executor = self._executor
+        child._owns_process_pool = False
+        child._fork_unsafe = set(self._fork_unsafe)
+        if child._fork_unsafe:
+            track(child)
+        child._shared_builds = self._shared_builds
+        child._params = self._params
+        return child
 
     def partial_copy(self, patterns):
         return self.new_child(resources=self.filter_resources(patterns))
@@ -1,4 +1,4 @@
-from asyncio import iscoroutinefunction, coroutine
+from asyncio import iscoroutinefunction, coroutine, get_event_loop
 from contextlib import contextmanager
 from functools import partial
 import re
@@ -41,16 +41,43 @@ def capture_exceptions():
             raise MultipleExceptions(exceptions)
 
 
-async def as_async(func, *args, **kwargs):
+async def as_async_in(executor, func, *args):
     if iscoroutinefunction(func):
-        return await func(*args, **kwargs)
-    return func(*args, **kwargs)
+        return await func(*args)
+    if executor is Undefined:
+        return func(*args)
+    return await run_in_executor(executor, func, *args)
+
+
+def run_in_executor(executor, func, *args):
+    return get_event_loop().run_in_executor(executor, partial(func, *args))
+
+
+def retrieve(future):
+    if not future.cancelled():
+        future.exception()
 
 
 def async_partial(*args, **kwargs):
     return coroutine(partial(*args, **kwargs))
 
 
+def for_each(handler):
+    if iscoroutinefunction(handler):
+        async def handle_each(instance, root, resources):
+            with capture_exceptions() as capture:
+                for resource in resources:
+                    with capture():
+                        await handler(instance, root, resource)
+    else:
+        def handle_each(instance, root, resources):
+            with capture_exceptions() as capture:
+                for resource in resources:
+                    with capture():
+                        handler(instance, root, resource)
+    return handle_each
+
+
 def make_caller(what_to_call):
     return lambda *a, **k: what_to_call()
 
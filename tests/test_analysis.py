@@ -0,0 +1,142 @@
+import pytest
+
+from baluster import Baluster, dependency_graph, placeholders
+
+
+class Fixtures(Baluster, analyse=True):
+
+    @placeholders.factory
+    def cr(self, root):
+        return 'cursor'
+
+    @placeholders.factory(args=['root', 'env'])
+    def config(self, root, env):
+        return env
+
+    class users(Baluster):
+
+        @placeholders.factory
+        def user(self, r):
+            return ('user', r.cr)
+
+        @placeholders.factory
+        def customer(self, root):
+            return ('customer', root.cr, root.config.get('name'))
+
+    class orders(Baluster):
+
+        factor = 2
+        amount = placeholders.value(100)
+
+        @placeholders.factory
+        def order(self, root):
+            return (root.users.customer, root.users.user, self.amount)
+
+        @placeholders.factory
+        def shipped_order(self, root):
+            order = self.order
+            return (order, self.factor)
+
+        @placeholders.factory(autowire=True)
+        def total(self, amount, currency, cr):
+            return amount
+
+        @placeholders.factory
+        def dynamic(self, root):
+            users = root.users
+            return (users.user, getattr(root, 'cr'), self.helper())
+
+        def helper(self):
+            return None
+
+
+class Circular(Baluster):
+
+    @placeholders.factory
+    def first(self, root):
+        return root.second
+
+    @placeholders.factory
+    def second(self, root):
+        return root.first
+
+
+class TestDependencyGraph:
+
+    def test_cached_per_class(self):
+        assert dependency_graph(Fixtures) is dependency_graph(Fixtures)
+        assert dependency_graph(Fixtures) is not \
+            dependency_graph(Fixtures.orders)
+
+    def test_dependencies(self):
+        graph = dependency_graph(Fixtures)
+
+        assert graph.dependencies_of('cr') == set()
+        assert graph.dependencies_of('users.user') == {'cr'}
+        assert graph.dependencies_of('users.customer') == {'cr', 'config'}
+        assert graph.dependencies_of('orders.order') == {
+            'users.customer', 'users.user', 'orders.amount'
+        }
+        assert graph.dependencies_of('orders.shipped_order') == {
+            'orders.order'
+        }
+        assert graph.dependencies_of('orders.total') == {
+            'orders.amount', 'cr'
+        }
+
+    def test_params(self):
+        graph = dependency_graph(Fixtures)
+
+        assert graph.params_of('config') == {'env'}
+        assert graph.params_of('orders.total') == {'currency'}
+        assert graph.dependents_of_params('env') == {
+            'config', 'users.customer', 'orders.order',
+            'orders.shipped_order'
+        }
+
+    def test_dependents(self):
+        graph = dependency_graph(Fixtures)
+
+        assert graph.dependents_of('users.user') == {
+            'orders.order', 'orders.shipped_order'
+        }
+
+    def test_unresolved_access_reported(self):
+        graph = dependency_graph(Fixtures)
+
+        assert graph.unresolved == {
+            'orders.dynamic': ('root.users', 'self.helper', 'root')
+        }
+        assert graph.dependencies_of('orders.dynamic') == set()
+
+    def test_nested_class_graph(self):
+        graph = dependency_graph(Fixtures.orders)
+
+        assert graph.dependencies_of('shipped_order') == {'order'}
+        assert 'root.users' in graph.unresolved['order']
+
+    def test_levels(self):
+        graph = dependency_graph(Fixtures)
+
+        assert graph.levels('orders.order') == [
+            ('config', 'cr', 'orders.amount'),
+            ('users.customer', 'users.user'),
+            ('orders.order',)
+        ]
+
+    def test_circular_dependency(self):
+        graph = dependency_graph(Circular)
+
+        with pytest.raises(ValueError):
+            graph.levels()
+
+    def test_source_not_available(self):
+        ns = dict(placeholders=placeholders)
+        exec('def generated(self, root):\n    return 1\n', ns)
+
+        class Generated(Baluster):
+            generated = placeholders.factory(ns['generated'])
+
+        assert dependency_graph(Generated).unresolved == {
+            'generated': ('<source of generated>',)
+        }
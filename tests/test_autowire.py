@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+
+from baluster import (
+    AsyncBaluster, Baluster, UnresolvedArgumentError, dependency_graph,
+    placeholders
+)
+
+
+class CompositeRoot(Baluster):
+
+    @placeholders.factory
+    def currency(self, root):
+        return 'EUR'
+
+    @placeholders.factory(autowire=True)
+    def unknown(self, missing):
+        return missing
+
+    @placeholders.factory(autowire=True)
+    def shadowing(self, enter, close='closed'):
+        return (enter, close)
+
+    class users(Baluster):
+
+        @placeholders.factory
+        def customer(self, root):
+            return 'customer'
+
+    class orders(Baluster):
+
+        @placeholders.factory(autowire=True)
+        def amount(self, root, base_amount=100):
+            return base_amount
+
+        @placeholders.factory(autowire=True)
+        def order(self, users, amount, currency, *, note=None):
+            return (users.customer, amount, currency, note)
+
+
+class AsyncCompositeRoot(AsyncBaluster):
+
+    _started = None
+
+    @placeholders.factory
+    async def first(self, root):
+        return await self.slow('first')
+
+    @placeholders.factory
+    async def second(self, root):
+        return await self.slow('second')
+
+    @placeholders.factory
+    def third(self, root):
+        return 'third'
+
+    @placeholders.factory(autowire=True)
+    async def combined(self, first, second, third):
+        return (first, second, third)
+
+    @placeholders.factory(autowire=True)
+    async def synchronous_only(self, third):
+        return third
+
+    async def slow(self, name):
+        if self._started is None:
+            self._started = []
+        self._started.append(name)
+        await asyncio.sleep(0)
+        assert len(self._started) == 2
+        return name
+
+
+class TestAutowire:
+
+    def test_resolve_members_root_and_params(self):
+        obj = CompositeRoot(base_amount=0, note='urgent')
+
+        assert obj.orders.order == ('customer', 0, 'EUR', 'urgent')
+
+    def test_root_methods_not_resolved(self):
+        root = CompositeRoot(enter='entered')
+
+        assert root.shadowing == ('entered', 'closed')
+        assert dependency_graph(CompositeRoot).params_of('shadowing') == {
+            'enter', 'close'
+        }
+
+    def test_defaults(self):
+        obj = CompositeRoot()
+
+        assert obj.orders.order == ('customer', 100, 'EUR', None)
+
+    def test_unresolved_argument(self):
+        obj = CompositeRoot()
+
+        with pytest.raises(UnresolvedArgumentError):
+            obj.unknown
+
+    def test_binding_plan(self):
+        arguments = CompositeRoot.orders.order.arguments
+
+        assert [(a.name, a.source) for a in arguments] == [
+            ('users', 'lookup'), ('amount', 'member'),
+            ('currency', 'lookup'), ('note', 'lookup')
+        ]
+        assert arguments[-1].keyword is True
+
+    def test_variable_arguments_rejected(self):
+        with pytest.raises(TypeError):
+            class Invalid(Baluster):
+
+                @placeholders.factory(autowire=True)
+                def invalid(self, *args):
+                    pass
+
+    @pytest.mark.asyncio
+    async def test_parallel_resolution(self):
+        obj = AsyncCompositeRoot()
+
+        assert await obj.combined == ('first', 'second', 'third')
+
+    @pytest.mark.asyncio
+    async def test_synchronous_dependencies(self):
+        obj = AsyncCompositeRoot()
+
+        assert await obj.synchronous_only == 'third'
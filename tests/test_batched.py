@@ -0,0 +1,151 @@
+import asyncio
+
+import pytest
+
+from baluster import AsyncBaluster, placeholders
+
+
+class CompositeRoot(AsyncBaluster):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.queries = []
+        self.closed = []
+
+    class users(AsyncBaluster):
+
+        @placeholders.batched
+        async def by_id(self, root, ids):
+            root.queries.append(ids)
+            await asyncio.sleep(0)
+            return ['user:{}'.format(i) for i in ids]
+
+        @by_id.close
+        def close_by_id(self, root, resource):
+            root.closed.append(resource)
+
+        @placeholders.batched(max_batch=2)
+        async def limited(self, root, ids):
+            root.queries.append(ids)
+            return {i: i for i in ids}
+
+        @placeholders.batched(maxsize=1)
+        async def bounded(self, root, ids):
+            return ['conn:{}'.format(i) for i in ids]
+
+        @bounded.close
+        def close_bounded(self, root, resource):
+            root.closed.append(resource)
+
+        @placeholders.batched
+        async def partial(self, root, ids):
+            return {i: i for i in ids if i != 'missing'}
+
+        @placeholders.batched
+        async def broken(self, root, ids):
+            raise ZeroDivisionError()
+
+        @placeholders.batched
+        async def mismatched(self, root, ids):
+            return []
+
+        @placeholders.batched
+        async def hanging(self, root, ids):
+            await asyncio.sleep(10)
+
+
+class TestBatched:
+
+    def test_sync_rejected(self):
+        with pytest.raises(TypeError):
+            placeholders.batched(lambda self, root, keys: keys)
+
+    @pytest.mark.asyncio
+    async def test_same_tick_batched(self):
+        root = CompositeRoot()
+
+        users = await asyncio.gather(*(root.users.by_id(i) for i in range(3)))
+
+        assert users == ['user:0', 'user:1', 'user:2']
+        assert root.queries == [[0, 1, 2]]
+
+    @pytest.mark.asyncio
+    async def test_cached_and_pending_keys(self):
+        root = CompositeRoot()
+        await root.users.by_id(1)
+
+        users = await asyncio.gather(
+            root.users.by_id(1), root.users.by_id(2), root.users.by_id(2)
+        )
+
+        assert users == ['user:1', 'user:2', 'user:2']
+        assert root.queries == [[1], [2]]
+
+    @pytest.mark.asyncio
+    async def test_close_handler_per_key(self):
+        root = CompositeRoot()
+
+        async with root.enter() as ctx:
+            await asyncio.gather(ctx.users.by_id(1), ctx.users.by_id(2))
+
+        assert ctx.closed == ['user:2', 'user:1']
+
+    @pytest.mark.asyncio
+    async def test_max_batch(self):
+        root = CompositeRoot()
+
+        await asyncio.gather(*(root.users.limited(i) for i in range(5)))
+
+        assert root.queries == [[0, 1], [2, 3], [4]]
+
+    @pytest.mark.asyncio
+    async def test_evicted_closed(self):
+        root = CompositeRoot()
+
+        found = await asyncio.gather(
+            root.users.bounded(1), root.users.bounded(2)
+        )
+
+        assert found == ['conn:1', 'conn:2']
+        assert root.closed == ['conn:1']
+        assert 2 in root.users.bounded
+
+    @pytest.mark.asyncio
+    async def test_missing_key(self):
+        root = CompositeRoot()
+
+        found, missing = await asyncio.gather(
+            root.users.partial('found'), root.users.partial('missing'),
+            return_exceptions=True
+        )
+
+        assert found == 'found'
+        assert isinstance(missing, KeyError)
+
+    @pytest.mark.asyncio
+    async def test_failures(self):
+        root = CompositeRoot()
+
+        results = await asyncio.gather(
+            root.users.broken(1), root.users.broken(2),
+            root.users.mismatched(1),
+            return_exceptions=True
+        )
+
+        assert isinstance(results[0], ZeroDivisionError)
+        assert isinstance(results[1], ZeroDivisionError)
+        assert isinstance(results[2], ValueError)
+        assert 1 not in root.users.broken
+
+    @pytest.mark.asyncio
+    async def test_cancelled_batch(self):
+        root = CompositeRoot()
+
+        waiter = asyncio.ensure_future(root.users.hanging(1))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        loader, = asyncio.all_tasks() - {asyncio.current_task(), waiter}
+        loader.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
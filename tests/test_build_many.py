@@ -0,0 +1,178 @@
+import pytest
+
+from baluster import (
+    AsyncBaluster, Baluster, MultipleExceptions, placeholders
+)
+
+
+class Order:
+
+    def __init__(self, customer, amount, quantity=1):
+        self.customer = customer
+        self.amount = amount
+        self.quantity = quantity
+        self.closed = False
+
+
+class Fixtures(Baluster):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.inserts = []
+        self.close_failures = 0
+
+    @placeholders.factory
+    def customer(self, root):
+        return object()
+
+    class orders(Baluster):
+
+        @placeholders.factory(cache=False, autowire=True)
+        def order(self, customer, amount=100, *, quantity=1):
+            return Order(customer, amount, quantity)
+
+        @order.close
+        def close_order(self, root, resource):
+            if root.close_failures:
+                root.close_failures -= 1
+                raise ValueError()
+            resource.closed = True
+
+        @placeholders.factory(cache=False)
+        def bulk_order(self, root, **overrides):
+            return Order(root.customer, **overrides)
+
+        @bulk_order.batch
+        def bulk_order_batch(self, root, count, **overrides):
+            root.inserts.append(count)
+            return [Order(root.customer, **overrides) for _ in range(count)]
+
+        @placeholders.factory(cache=False, args=['root', 'currency'])
+        def priced(self, root, currency):
+            return currency
+
+        priced.batch(lambda self, root, currency, count: [currency] * count)
+
+
+class AsyncFixtures(AsyncBaluster):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.close_failures = 0
+
+    @placeholders.factory
+    async def customer(self, root):
+        return 'customer'
+
+    @placeholders.factory(cache=False, autowire=True)
+    async def order(self, customer, amount=100):
+        return Order(customer, amount)
+
+    @order.close
+    async def close_order(self, root, resource):
+        if root.close_failures:
+            root.close_failures -= 1
+            raise ValueError()
+        resource.closed = True
+
+    @placeholders.factory(cache=False)
+    async def bulk_order(self, root):
+        return Order(await root.customer, 100)
+
+    @bulk_order.batch
+    async def bulk_order_batch(self, root, count, *, amount):
+        return [Order(await root.customer, amount) for _ in range(count)]
+
+
+class TestBuildMany:
+
+    def test_build_many(self):
+        root = Fixtures()
+
+        orders = root.orders.build_many('order', 3, amount=50, quantity=2)
+
+        assert len(orders) == 3
+        assert len(set(map(id, orders))) == 3
+        assert all(o.customer is root.customer for o in orders)
+        assert all((o.amount, o.quantity) == (50, 2) for o in orders)
+
+    def test_close_handler_registered_once(self):
+        root = Fixtures()
+
+        with root.enter() as ctx:
+            orders = ctx.orders.build_many('order', 3)
+            assert len(ctx._state._close_handlers) == 1
+
+        assert all(o.closed for o in orders)
+
+    def test_close_continues_after_error(self):
+        root = Fixtures()
+
+        with pytest.raises(ValueError):
+            with root.enter() as ctx:
+                ctx.close_failures = 1
+                orders = ctx.orders.build_many('order', 3)
+
+        assert [o.closed for o in orders] == [False, True, True]
+
+    def test_close_errors_collected(self):
+        root = Fixtures()
+
+        with pytest.raises(MultipleExceptions) as ex:
+            with root.enter() as ctx:
+                ctx.close_failures = 2
+                orders = ctx.orders.build_many('order', 3)
+
+        assert len(ex.value.exceptions) == 2
+        assert [o.closed for o in orders] == [False, False, True]
+
+    def test_nothing_built(self):
+        root = Fixtures()
+
+        assert root.orders.build_many('order', 0) == []
+        assert root._state._close_handlers == []
+
+    def test_batch_form(self):
+        root = Fixtures()
+
+        orders = root.orders.build_many('bulk_order', 4, amount=10)
+
+        assert root.inserts == [4]
+        assert [o.amount for o in orders] == [10, 10, 10, 10]
+
+    def test_params(self):
+        root = Fixtures(currency='EUR')
+
+        assert root.orders.build_many('priced', 2) == ['EUR', 'EUR']
+        assert root.orders.build_many('priced', 1, currency='USD') == ['USD']
+
+    @pytest.mark.asyncio
+    async def test_async_build_many(self):
+        root = AsyncFixtures()
+
+        async with root.enter() as ctx:
+            orders = await ctx.build_many('order', 2, amount=5)
+            assert [(o.customer, o.amount) for o in orders] == [
+                ('customer', 5), ('customer', 5)
+            ]
+
+        assert all(o.closed for o in orders)
+
+    @pytest.mark.asyncio
+    async def test_async_close_continues_after_error(self):
+        root = AsyncFixtures()
+
+        with pytest.raises(ValueError):
+            async with root.enter() as ctx:
+                ctx.close_failures = 1
+                orders = await ctx.build_many('order', 3)
+
+        assert [o.closed for o in orders] == [False, True, True]
+
+    @pytest.mark.asyncio
+    async def test_async_batch_form(self):
+        root = AsyncFixtures()
+
+        orders = await root.build_many('bulk_order', 2, amount=5)
+
+        assert [o.amount for o in orders] == [5, 5]
@@ -0,0 +1,156 @@
+import os
+from threading import Lock, Thread
+from time import sleep
+
+import pytest
+
+from baluster import Baluster, SharedBuilds, placeholders, xdist_builds
+
+
+calls = []
+
+
+class CompositeRoot(Baluster):
+
+    @placeholders.factory(args=['size'], share_build=True)
+    def dataset(self, size):
+        calls.append('dataset')
+        return list(range(size or 3))
+
+    @placeholders.factory
+    def local(self, root):
+        calls.append('local')
+        return []
+
+    @placeholders.factory(share_build=True)
+    def lock(self, root):
+        calls.append('lock')
+        return Lock()
+
+    @placeholders.factory(lazy=True, share_build=True)
+    def lazy(self, root):
+        calls.append('lazy')
+        return {'a': 1}
+
+
+@pytest.fixture
+def builds(tmp_path):
+    del calls[:]
+    return SharedBuilds(str(tmp_path / 'builds'))
+
+
+def make_root(builds, **params):
+    root = CompositeRoot(**params)
+    root.set_shared_builds(builds)
+    return root
+
+
+class TestSharedBuilds:
+
+    def test_built_once(self, builds):
+        first = make_root(builds).dataset
+
+        second = make_root(builds).dataset
+
+        assert first == second == [0, 1, 2]
+        assert calls == ['dataset']
+
+    def test_scopes_use_shared_builds(self, builds):
+        make_root(builds).dataset
+
+        with make_root(builds).enter() as ctx:
+            assert ctx.dataset == [0, 1, 2]
+        assert calls == ['dataset']
+
+    def test_params(self, builds):
+        make_root(builds).dataset
+
+        assert make_root(builds, size=1).dataset == [0]
+        assert calls == ['dataset', 'dataset']
+
+    def test_not_opted_in(self, builds):
+        make_root(builds).local
+        make_root(builds).local
+
+        assert calls == ['local', 'local']
+
+    @pytest.mark.parametrize('decorator', [
+        placeholders.factory(cache=False, share_build=True),
+        placeholders.keyed(share_build=True),
+    ])
+    def test_rejected(self, decorator):
+        with pytest.raises(TypeError):
+            decorator(lambda self, root: None)
+
+    def test_async_rejected(self):
+        async def factory(self, root):
+            pass
+
+        with pytest.raises(TypeError):
+            placeholders.factory(factory, share_build=True)
+
+    def test_value_dependency_rejected(self, builds):
+
+        class Root(Baluster):
+
+            size = placeholders.value()
+
+            @placeholders.factory(share_build=True)
+            def dataset(self, root):
+                return list(range(root.size))
+
+        root = Root()
+        root.set_shared_builds(builds)
+        root.size = 3
+
+        with pytest.raises(TypeError):
+            root.dataset
+
+    def test_lazy(self, builds):
+        make_root(builds).lazy['a']
+
+        assert make_root(builds).lazy['a'] == 1
+        assert calls == ['lazy']
+
+    def test_unpicklable_built_locally(self, builds):
+        make_root(builds).lock
+        make_root(builds).lock
+
+        assert calls == ['lock', 'lock']
+
+    def test_concurrent_builds(self, builds):
+        def build(self, root):
+            sleep(0.05)
+            calls.append('slow')
+            return 'value'
+
+        class Root(Baluster):
+
+            slow = placeholders.factory(build, share_build=True)
+
+        results = []
+
+        def worker():
+            root = Root()
+            root.set_shared_builds(SharedBuilds(builds.directory))
+            results.append(root.slow)
+
+        threads = [Thread(target=worker) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == ['value'] * 3
+        assert calls == ['slow']
+
+    def test_xdist_builds(self, monkeypatch):
+        monkeypatch.delenv('PYTEST_XDIST_TESTRUNUID', raising=False)
+
+        assert xdist_builds() is None
+
+        monkeypatch.setenv('PYTEST_XDIST_TESTRUNUID', 'abc')
+
+        assert xdist_builds().directory.endswith(
+            os.path.join('', 'baluster-abc')
+        )
@@ -0,0 +1,146 @@
+import asyncio
+
+import pytest
+
+from baluster import AsyncBaluster, BackgroundCloser, placeholders
+
+
+class Connection:
+
+    def __init__(self):
+        self.closed = False
+
+
+class CompositeRoot(AsyncBaluster):
+
+    @placeholders.factory
+    def connection(self, root):
+        return Connection()
+
+    @connection.close
+    async def close_connection(self, root, resource):
+        await asyncio.sleep(0.01)
+        resource.closed = True
+
+    @placeholders.factory
+    def buggy(self, root):
+        return Connection()
+
+    @buggy.close
+    def close_buggy(self, root, resource):
+        raise ZeroDivisionError()
+
+    @placeholders.factory
+    def other_buggy(self, root):
+        return Connection()
+
+    @other_buggy.close
+    def close_other_buggy(self, root, resource):
+        raise KeyError()
+
+
+class TestBackgroundCloser:
+
+    @pytest.mark.asyncio
+    async def test_closed_in_background(self):
+        root = CompositeRoot()
+        closer = BackgroundCloser()
+
+        async with root.enter(closer=closer) as ctx:
+            connection = ctx.connection
+
+        assert connection.closed is False
+        await closer.drain()
+        assert connection.closed is True
+        assert closer.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_drain_unused(self):
+        closer = BackgroundCloser()
+
+        await closer.drain()
+
+        assert closer.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_backpressure(self):
+        root = CompositeRoot()
+        closer = BackgroundCloser(maxsize=1)
+        connections = []
+
+        async def request():
+            async with root.enter(closer=closer) as ctx:
+                connections.append(ctx.connection)
+
+        await request()
+        await request()
+        assert closer.pending == 1
+        blocked = asyncio.ensure_future(request())
+        await asyncio.sleep(0)
+        assert not blocked.done()
+
+        await blocked
+        await closer.drain()
+        assert all(c.closed for c in connections)
+
+    @pytest.mark.asyncio
+    async def test_errors_reported(self):
+        root = CompositeRoot()
+        errors = []
+        closer = BackgroundCloser(
+            on_error=lambda scope, ex: errors.append((scope, ex))
+        )
+
+        async with root.enter(closer=closer) as first:
+            first.buggy
+        async with root.enter(closer=closer) as second:
+            second.buggy
+            second.other_buggy
+        await closer.drain()
+
+        assert [scope for scope, _ in errors] == [first, second, second]
+        assert isinstance(errors[0][1], ZeroDivisionError)
+        assert isinstance(errors[1][1], KeyError)
+
+    @pytest.mark.asyncio
+    async def test_default_error_handler(self):
+        root = CompositeRoot()
+        closer = BackgroundCloser()
+        contexts = []
+        loop = asyncio.get_event_loop()
+        loop.set_exception_handler(lambda loop, ctx: contexts.append(ctx))
+
+        async with root.enter(closer=closer) as ctx:
+            ctx.buggy
+        await closer.drain()
+
+        loop.set_exception_handler(None)
+        assert isinstance(contexts[0]['exception'], ZeroDivisionError)
+
+    @pytest.mark.asyncio
+    async def test_failing_error_handler(self):
+        def on_error(scope, exception):
+            raise RuntimeError()
+
+        root = CompositeRoot()
+        closer = BackgroundCloser(maxsize=1, on_error=on_error)
+        contexts = []
+        loop = asyncio.get_event_loop()
+        loop.set_exception_handler(lambda loop, ctx: contexts.append(ctx))
+
+        async def use_scopes():
+            for _ in range(3):
+                async with root.enter(closer=closer) as ctx:
+                    ctx.buggy
+            async with root.enter(closer=closer) as last:
+                connection = last.connection
+            await closer.drain()
+            return connection
+
+        try:
+            connection = await asyncio.wait_for(use_scopes(), 1)
+        finally:
+            loop.set_exception_handler(None)
+        assert connection.closed
+        assert len(contexts) == 3
+        assert isinstance(contexts[0]['exception'], RuntimeError)
@@ -0,0 +1,126 @@
+import pytest
+
+from baluster import AsyncBaluster, Baluster, placeholders
+from baluster.compiler import is_compiled
+from baluster.makers import FactoryMaker
+
+
+class CompositeRoot(Baluster, compiled=True):
+
+    config = placeholders.value(dict)
+
+    @placeholders.factory
+    def db(self, root):
+        return object()
+
+    @placeholders.factory(cache=False)
+    def uncached(self, root):
+        return object()
+
+    @placeholders.factory(inject='service')
+    def service(self, root):
+        return 'service'
+
+    class nested(Baluster, compiled=True):
+
+        @placeholders.factory
+        def repository(self, root):
+            return (root.db, )
+
+
+class SubRoot(CompositeRoot):
+
+    @placeholders.factory
+    def extra(self, root):
+        return root.db
+
+
+class CustomRoot(CompositeRoot, compiled=True):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.custom = True
+
+
+class AsyncRoot(AsyncBaluster, compiled=True):
+
+    @placeholders.factory
+    async def db(self, root):
+        return object()
+
+
+class TestCompiled:
+
+    def test_compiled(self):
+        assert is_compiled(CompositeRoot.__new__)
+        assert is_compiled(CompositeRoot.__init__)
+        assert isinstance(CompositeRoot.db, FactoryMaker)
+        assert type(CompositeRoot.__dict__['db']).__name__ == 'db_accessor'
+        assert not is_compiled(CustomRoot.__init__)
+
+    def test_values(self):
+        root = CompositeRoot()
+        db = root.db
+
+        assert root.db is db
+        assert root.nested.repository == (db, )
+        assert root.uncached is not root.uncached
+        assert root.config == {}
+
+    def test_set_and_delete(self):
+        root = CompositeRoot()
+        root.db = 1
+
+        assert root.db == 1
+        with pytest.raises(AttributeError):
+            root.db = 2
+        with pytest.raises(AttributeError):
+            del root.db
+
+    def test_inject(self):
+        root = CompositeRoot()
+        providers = {}
+
+        class Binder:
+            def bind_to_provider(self, name, provider):
+                providers[name] = provider
+
+        root.inject_config(Binder())
+
+        assert providers['service']() == 'service'
+
+    def test_scopes(self):
+        root = CompositeRoot()
+        db = root.db
+
+        with root.enter() as ctx:
+            assert ctx.db is db
+            assert ctx.nested.repository == (db, )
+            ctx.invalidate('db')
+            assert ctx.db is not db
+
+    def test_subclass(self):
+        root = SubRoot()
+
+        assert root.extra is root.db
+        assert root.nested.repository == (root.db, )
+
+    def test_custom_init(self):
+        root = CustomRoot()
+
+        assert root.custom
+        assert root.nested.repository == (root.db, )
+
+    def test_frozen(self):
+        root = CompositeRoot()
+        root.nested.repository
+
+        root.freeze('db', 'nested.repository')
+
+        assert root.db is root.nested.repository[0]
+
+    @pytest.mark.asyncio
+    async def test_async(self):
+        root = AsyncRoot()
+
+        assert await root.db is await root.db
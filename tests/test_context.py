@@ -74,3 +74,27 @@ class TestContextData:
             with pytest.raises(KeyError):
                 del ctx['a']
             assert ctx['a'] == 1
+
+    def test_set_on_root_after_enter(self):
+        root = Root()
+
+        with root.enter() as ctx:
+            root['value'] = 1
+            assert ctx['value'] == 1
+
+    def test_nested_scopes(self):
+        root = Root()
+        root['value'] = 1
+
+        with root.enter() as ctx:
+            with ctx.enter() as inner:
+                ctx['value'] = 2
+                ctx['other'] = 3
+                assert inner['value'] == 2
+                inner['value'] = 4
+                assert inner['other'] == 3
+                assert ctx['value'] == 2
+            assert 'other' in ctx
+
+        assert root['value'] == 1
+        assert 'other' not in root
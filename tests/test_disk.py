@@ -0,0 +1,170 @@
+import os
+import pickle
+from threading import Lock
+
+import pytest
+
+from baluster import Baluster, placeholders
+from baluster.disk import DEFAULT_DIRECTORY, DiskCache, source_hash
+
+
+calls = []
+
+
+class Unknown:
+    pass
+
+
+def make_root(directory):
+
+    class CompositeRoot(Baluster):
+
+        @placeholders.factory(args=['seed'])
+        def base(self, seed):
+            return seed or 0
+
+        @placeholders.factory(disk_cache=directory, args=['root', 'size'])
+        def dataset(self, root, size):
+            calls.append(size)
+            return list(range(root.base, root.base + size))
+
+        @dataset.close
+        def close_dataset(self, root, resource):
+            resource.append('closed')
+
+        class models(Baluster):
+
+            @placeholders.factory(disk_cache=directory)
+            def model(self, root):
+                calls.append('model')
+                return {'weights': root.dataset}
+
+    return CompositeRoot
+
+
+@pytest.fixture
+def directory(tmp_path):
+    del calls[:]
+    return str(tmp_path / 'cache')
+
+
+class TestDiskCache:
+
+    def test_async_factory_rejected(self):
+        async def factory(self, root):
+            pass
+
+        with pytest.raises(TypeError):
+            placeholders.factory(factory, disk_cache=True)
+
+    def test_default_directory(self):
+        maker = placeholders.factory(lambda self, root: 1, disk_cache=True)
+
+        assert maker._disk_cache.directory == DEFAULT_DIRECTORY
+
+    def test_cached_across_roots(self, directory):
+        first = make_root(directory)(size=3)
+        dataset = first.dataset
+
+        second = make_root(directory)(size=3)
+
+        assert second.dataset == [0, 1, 2]
+        assert second.dataset is not dataset
+        assert calls == [3]
+
+    def test_close_handler_applies_to_loaded(self, directory):
+        make_root(directory)(size=1).dataset
+        root = make_root(directory)(size=1)
+        dataset = root.dataset
+
+        root.close()
+
+        assert dataset == [0, 'closed']
+
+    def test_params_invalidate(self, directory):
+        Root = make_root(directory)
+        Root(size=3).dataset
+        Root(size=4).dataset
+
+        assert Root(size=4).dataset == [0, 1, 2, 3]
+        assert calls == [3, 4]
+
+    def test_dependency_params_invalidate(self, directory):
+        Root = make_root(directory)
+        Root(size=2).models.model
+        Root(size=2, seed=5).models.model
+
+        assert Root(size=2, seed=5).models.model == {'weights': [5, 6]}
+        assert calls == ['model', 2, 'model', 2]
+
+    def test_value_dependency_rejected(self, directory):
+
+        class Root(Baluster):
+
+            size = placeholders.value()
+
+            @placeholders.factory(disk_cache=directory)
+            def dataset(self, root):
+                return list(range(root.size))
+
+        root = Root()
+        root.size = 3
+
+        with pytest.raises(TypeError):
+            root.dataset
+
+    def test_data_dependency_rejected(self, directory):
+
+        class Root(Baluster):
+
+            @placeholders.factory(disk_cache=directory)
+            def dataset(self, root):
+                return list(range(root['size']))
+
+        root = Root()
+        root['size'] = 3
+
+        with pytest.raises(TypeError):
+            root.dataset
+
+    def test_source_hash(self):
+        def first(self, root):
+            return 1
+
+        def second(self, root):
+            return 2
+
+        assert source_hash(placeholders.factory(first)) != \
+            source_hash(placeholders.factory(second))
+        assert source_hash(placeholders.value()) == b''
+
+    def test_source_without_file(self):
+        namespace = {}
+        exec('def factory(self, root):\n    return 1\n', namespace)
+
+        assert source_hash(placeholders.factory(namespace['factory']))
+
+    @pytest.mark.parametrize('content', [
+        b'broken',
+        b'',
+        pickle.dumps(list(range(100)))[:-10],
+        pickle.dumps(Unknown).replace(b'Unknown', b'Missing'),
+        pickle.dumps(Unknown).replace(b'test_disk', b'test_gone'),
+    ])
+    def test_broken_entry(self, directory, content):
+        cache = DiskCache(directory)
+        cache.store('entry', [1])
+        with open(os.path.join(directory, 'entry.pickle'), 'wb') as f:
+            f.write(content)
+
+        assert cache.load('entry') == (False, None)
+        assert os.listdir(directory) == []
+        assert cache.load('missing') == (False, None)
+
+    def test_unpicklable_value(self, directory):
+        cache = DiskCache(directory)
+
+        with pytest.raises(TypeError):
+            cache.store('entry', Lock())
+
+        assert os.listdir(directory) == []
@@ -0,0 +1,122 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import get_ident
+
+import pytest
+
+from baluster import AsyncBaluster, placeholders
+
+
+class Connection:
+
+    def __init__(self):
+        self.opened_in = get_ident()
+        self.closed_in = None
+
+
+class CompositeRoot(AsyncBaluster):
+
+    @placeholders.factory(executor=True)
+    def db(self, root):
+        return Connection()
+
+    @db.close(invalidate=True)
+    def close_db(self, root, resource):
+        resource.closed_in = get_ident()
+
+    @placeholders.factory(executor=True, cache=False)
+    def uncached(self, root):
+        return Connection()
+
+    @uncached.close
+    async def close_uncached(self, root, resource):
+        resource.closed_in = get_ident()
+
+    @placeholders.factory
+    def inline(self, root):
+        return Connection()
+
+    @inline.close
+    def close_inline(self, root, resource):
+        resource.closed_in = get_ident()
+
+
+class TestExecutor:
+
+    def test_async_factory_rejected(self):
+        async def factory(self, root):
+            pass
+
+        with pytest.raises(TypeError):
+            placeholders.factory(factory, executor=True)
+
+    def test_lazy_rejected(self):
+        with pytest.raises(TypeError):
+            placeholders.factory(
+                lambda self, root: 1, executor=True, lazy=True
+            )
+
+    @pytest.mark.asyncio
+    async def test_default_executor(self):
+        root = CompositeRoot()
+
+        async with root.enter() as ctx:
+            db = await ctx.db
+            assert db.opened_in != get_ident()
+            assert await ctx.db is db
+            inline = ctx.inline
+
+        assert db.closed_in not in (None, get_ident())
+        assert inline.closed_in == get_ident()
+
+    @pytest.mark.asyncio
+    async def test_root_executor(self):
+        executor = ThreadPoolExecutor(1)
+        worker = executor.submit(get_ident).result()
+        root = CompositeRoot()
+        root.set_executor(executor)
+
+        async with root.enter() as ctx:
+            db = await ctx.db
+            uncached = await ctx.uncached
+            inline = ctx.inline
+
+        executor.shutdown()
+        assert db.opened_in == worker
+        assert db.closed_in == worker
+        assert uncached.closed_in == get_ident()
+        assert inline.closed_in == worker
+
+    @pytest.mark.asyncio
+    async def test_factory_executor(self):
+        executor = ThreadPoolExecutor(1)
+        worker = executor.submit(get_ident).result()
+
+        class Root(AsyncBaluster):
+
+            @placeholders.factory(executor=executor)
+            def db(self, root):
+                return Connection()
+
+        db = await Root().db
+
+        executor.shutdown()
+        assert db.opened_in == worker
+
+    @pytest.mark.asyncio
+    async def test_build_many(self):
+        root = CompositeRoot()
+
+        connections = await root.build_many('uncached', 2)
+
+        assert len(connections) == 2
+        assert connections[0].opened_in != get_ident()
+
+    @pytest.mark.asyncio
+    async def test_invalidate(self):
+        root = CompositeRoot()
+        root.set_executor(None)
+        inline = root.inline
+
+        await root.ainvalidate('inline')
+
+        assert inline.closed_in not in (None, get_ident())
@@ -0,0 +1,129 @@
+import os
+import pickle
+
+import pytest
+
+from baluster import Baluster, placeholders
+from baluster.fork import reset_after_fork
+
+
+class Connection:
+
+    def __init__(self):
+        self.closed = False
+
+
+class CompositeRoot(Baluster):
+
+    @placeholders.factory
+    def config(self, root):
+        return {'dsn': 'db://'}
+
+    @placeholders.factory(fork_safe=False)
+    def db(self, root):
+        return Connection()
+
+    @db.close
+    def close_db(self, root, resource):
+        resource.closed = True
+
+    @placeholders.factory
+    def cursor(self, root):
+        return (root.db, )
+
+    @placeholders.keyed(fork_safe=False)
+    def sessions(self, root, key):
+        return Connection()
+
+    class cache(Baluster):
+
+        @placeholders.factory(fork_safe=False, lazy=True)
+        def client(self, root):
+            return Connection()
+
+
+class TestFork:
+
+    def test_unsafe_resources_reset(self):
+        root = CompositeRoot()
+        config = root.config
+        db = root.db
+        session = root.sessions['a']
+        client = root.cache.client
+
+        reset_after_fork()
+
+        assert root.config is config
+        assert root.db is not db
+        assert root.sessions['a'] is not session
+        assert root.cache.client is not client
+        root.close()
+        assert not db.closed
+
+    def test_dependents_reset(self):
+        root = CompositeRoot()
+        cursor = root.cursor
+
+        reset_after_fork()
+
+        assert root.cursor is not cursor
+        assert root.cursor[0] is root.db
+
+    def test_scope_dependents_reset(self):
+        root = CompositeRoot()
+        root.db
+
+        with root.enter() as ctx:
+            cursor = ctx.cursor
+            reset_after_fork()
+            assert ctx.cursor is not cursor
+
+    def test_child_scopes_reset(self):
+        root = CompositeRoot()
+        db = root.db
+
+        with root.enter() as ctx:
+            reset_after_fork()
+
+            assert ctx.db is not db
+
+    def test_scope_resources_reset(self):
+        root = CompositeRoot()
+
+        with root.enter() as ctx:
+            db = ctx.db
+            reset_after_fork()
+            assert ctx.db is not db
+
+        assert not db.closed
+
+    def test_untouched_roots(self):
+        root = CompositeRoot()
+        config = root.config
+
+        reset_after_fork()
+
+        assert root.config is config
+
+    @pytest.mark.skipif(
+        not hasattr(os, 'fork'), reason='Requires os.fork'
+    )
+    def test_fork(self):
+        root = CompositeRoot()
+        db = root.db
+        config = root.config
+        read, write = os.pipe()
+
+        pid = os.fork()
+        if pid == 0:
+            os.close(read)
+            result = (root.db is db, root.config is config, db.closed)
+            os.write(write, pickle.dumps(result))
+            os._exit(0)
+        os.close(write)
+        with os.fdopen(read, 'rb') as f:
+            result = pickle.loads(f.read())
+        os.waitpid(pid, 0)
+
+        assert result == (False, True, False)
+        assert root.db is db
@@ -0,0 +1,199 @@
+import os
+import pickle
+
+import pytest
+
+from baluster import AsyncBaluster, Baluster, FrozenError, placeholders
+from baluster.fork import reset_after_fork
+
+
+closed = []
+
+
+def helper():
+    return 'helper'
+
+
+class CompositeRoot(Baluster):
+
+    config = placeholders.value(dict)
+
+    @placeholders.factory
+    def db(self, root):
+        return object()
+
+    @db.close
+    def close_db(self, root, resource):
+        closed.append(resource)
+
+    @placeholders.factory
+    def function(self, root):
+        return helper
+
+    @placeholders.factory
+    def unresolved(self, root):
+        return object()
+
+    @placeholders.keyed
+    def users(self, root, key):
+        return key
+
+    @placeholders.factory(cache=False)
+    def order(self, root):
+        return object()
+
+    @placeholders.factory(fork_safe=False)
+    def connection(self, root):
+        return object()
+
+    @placeholders.factory
+    def cursor(self, root):
+        return (root.connection, )
+
+    class nested(Baluster):
+
+        @placeholders.factory
+        def service(self, root):
+            return (root.db, )
+
+
+class AsyncRoot(AsyncBaluster):
+
+    @placeholders.factory
+    async def db(self, root):
+        return object()
+
+
+def make_frozen():
+    root = CompositeRoot()
+    root.config
+    root.function
+    root.nested.service
+    return root, root.freeze('db', 'nested.service')
+
+
+class TestFrozen:
+
+    def test_values(self):
+        root, frozen = make_frozen()
+        db = root.db
+
+        assert frozen is root
+        assert isinstance(root, CompositeRoot)
+        assert root.db is db
+        assert root.nested.service == (db, )
+        assert root.function is helper
+        assert root.config == {}
+
+    def test_unresolved(self):
+        with pytest.raises(ValueError):
+            CompositeRoot().freeze('db')
+
+        root, _ = make_frozen()
+
+        with pytest.raises(FrozenError):
+            root.unresolved
+        with pytest.raises(FrozenError):
+            root.users
+        assert type(root).unresolved is not None
+
+    def test_uncached(self):
+        root, _ = make_frozen()
+
+        assert root.order is not root.order
+
+    def test_fork_unsafe_reset(self):
+        root = CompositeRoot()
+        cursor = root.cursor
+        connection = root.connection
+        root.freeze('connection', 'cursor')
+
+        assert root.connection is connection
+        assert root.cursor is cursor
+        reset_after_fork()
+
+        assert root.connection is not connection
+        assert root.cursor is not cursor
+        assert root.cursor == (root.connection, )
+
+    @pytest.mark.skipif(
+        not hasattr(os, 'fork'), reason='Requires os.fork'
+    )
+    def test_fork(self):
+        root = CompositeRoot()
+        connection = root.connection
+        root.cursor
+        root.freeze('connection', 'cursor')
+        read, write = os.pipe()
+
+        pid = os.fork()
+        if pid == 0:
+            os.close(read)
+            result = (
+                root.connection is connection,
+                root.cursor[0] is connection
+            )
+            os.write(write, pickle.dumps(result))
+            os._exit(0)
+        os.close(write)
+        with os.fdopen(read, 'rb') as f:
+            result = pickle.loads(f.read())
+        os.waitpid(pid, 0)
+
+        assert result == (False, False)
+        assert root.connection is connection
+
+    def test_writes_rejected(self):
+        root, _ = make_frozen()
+
+        with pytest.raises(FrozenError):
+            root.db = 1
+        with pytest.raises(FrozenError):
+            root.nested.service = 1
+        with pytest.raises(FrozenError):
+            del root.db
+        with pytest.raises(FrozenError):
+            root['data'] = 1
+        with pytest.raises(FrozenError):
+            del root['data']
+        with pytest.raises(FrozenError):
+            root.invalidate('db')
+        with pytest.raises(FrozenError):
+            root.update_params(debug=True)
+
+    def test_scopes_writable(self):
+        root, _ = make_frozen()
+
+        with root.enter() as ctx:
+            assert type(ctx) is CompositeRoot
+            assert ctx.db is root.db
+            ctx['data'] = 1
+            ctx.unresolved
+            ctx.invalidate('db')
+            assert ctx.db is not root.db
+
+        assert root.thread_scope().db is root.db
+        assert root.partial_copy('db').db is root.db
+        assert root.build_many('users', 0) == []
+
+    def test_close(self):
+        root, _ = make_frozen()
+
+        root.close()
+
+        assert closed[-1] is root.db
+
+    @pytest.mark.asyncio
+    async def test_async(self):
+        root = AsyncRoot()
+        db = await root.db
+        root.freeze('db')
+
+        assert await root.db is db
+        assert await root.db is db
+
+        async with root.enter(prefetch=['db']) as ctx:
+            assert await ctx.db is db
+
+        with pytest.raises(FrozenError):
+            await root.ainvalidate('db')
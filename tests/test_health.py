@@ -0,0 +1,382 @@
+import asyncio
+
+import pytest
+
+from baluster import (
+    AsyncBaluster, HealthChecker, MultipleExceptions, placeholders
+)
+
+
+class Connection:
+
+    def __init__(self, number):
+        self.number = number
+        self.healthy = True
+        self.closed = False
+
+
+class AsyncRoot(AsyncBaluster):
+
+    @placeholders.factory
+    def db(self, root):
+        root['created'] = root['created'] + 1
+        return Connection(root['created'])
+
+    @db.close
+    def close_db(self, root, db):
+        db.closed = True
+
+    @db.health
+    def check_db(self, root, db):
+        if db.healthy is None:
+            raise ConnectionError()
+        return db.healthy
+
+    @placeholders.factory
+    async def upstream(self, root):
+        if root['fail_create']:
+            raise RuntimeError()
+        return Connection(0)
+
+    @upstream.close
+    async def close_upstream(self, root, upstream):
+        if root['fail_close']:
+            raise ValueError()
+        upstream.closed = True
+
+    @upstream.health
+    async def check_upstream(self, root, upstream):
+        await asyncio.sleep(0)
+        return upstream.healthy
+
+    @placeholders.factory
+    def cursor(self, root):
+        return (self.db.number, )
+
+    @placeholders.factory(executor=True)
+    def offloaded(self, root):
+        return Connection(0)
+
+    @offloaded.health
+    def check_offloaded(self, root, offloaded):
+        return offloaded.healthy
+
+    @placeholders.factory
+    async def hanging(self, root):
+        return Connection(0)
+
+    @hanging.health
+    async def check_hanging(self, root, hanging):
+        if not hanging.healthy:
+            await asyncio.Event().wait()
+        return True
+
+    @placeholders.factory(lazy=True)
+    def deferred(self, root):
+        root['created'] = root['created'] + 1
+        return Connection(root['created'])
+
+    @deferred.health
+    def check_deferred(self, root, deferred):
+        return deferred.healthy
+
+    class pool(AsyncBaluster):
+
+        @placeholders.factory
+        def connection(self, root):
+            return Connection(0)
+
+        @connection.health
+        def check_connection(self, root, connection):
+            return connection.healthy
+
+
+def make_root():
+    root = AsyncRoot()
+    root['created'] = 0
+    root['fail_close'] = False
+    root['fail_create'] = False
+    return root
+
+
+class TestCheckHealth:
+
+    @pytest.mark.asyncio
+    async def test_healthy_kept(self):
+        root = make_root()
+        db = root.db
+
+        assert await root.check_health() == []
+        assert root.db is db
+        assert not db.closed
+
+    @pytest.mark.asyncio
+    async def test_not_created_not_probed(self):
+        root = make_root()
+
+        assert await root.check_health() == []
+        assert root['created'] == 0
+
+    @pytest.mark.asyncio
+    async def test_unhealthy_replaced(self):
+        root = make_root()
+        db = root.db
+        db.healthy = False
+
+        assert await root.check_health() == ['db']
+        assert db.closed
+        assert root.db is not db
+        assert root.db.number == 2
+        assert root.get_stats() == {'db': {'unhealthy': 1}}
+
+    @pytest.mark.asyncio
+    async def test_nested(self):
+        root = make_root()
+        connection = root.pool.connection
+        connection.healthy = False
+
+        assert await root.check_health() == ['pool.connection']
+        assert root.pool.connection is not connection
+
+    @pytest.mark.asyncio
+    async def test_exception_unhealthy(self):
+        root = make_root()
+        db = root.db
+        db.healthy = None
+
+        assert await root.check_health() == ['db']
+        assert db.closed
+        assert root.db.number == 2
+
+    @pytest.mark.asyncio
+    async def test_async_probe(self):
+        root = make_root()
+        upstream = await root.upstream
+        upstream.healthy = False
+
+        assert await root.check_health() == ['upstream']
+        assert upstream.closed
+        assert await root.upstream is not upstream
+
+    @pytest.mark.asyncio
+    async def test_executor_probe(self):
+        root = make_root()
+        offloaded = await root.offloaded
+        offloaded.healthy = False
+
+        assert await root.check_health() == ['offloaded']
+        assert await root.offloaded is not offloaded
+
+    @pytest.mark.asyncio
+    async def test_probe_timeout(self):
+        root = make_root()
+        hanging = await root.hanging
+        hanging.healthy = False
+        root.db.healthy = False
+
+        unhealthy = await asyncio.wait_for(root.check_health(timeout=0.01), 1)
+
+        assert unhealthy == ['db', 'hanging']
+        assert await root.hanging is not hanging
+
+    @pytest.mark.asyncio
+    async def test_probes_concurrent(self):
+        started = asyncio.Event()
+
+        class Root(AsyncBaluster):
+
+            @placeholders.factory
+            async def first(self, root):
+                return 1
+
+            @first.health
+            async def check_first(self, root, first):
+                await started.wait()
+                return True
+
+            @placeholders.factory
+            async def second(self, root):
+                return 2
+
+            @second.health
+            async def check_second(self, root, second):
+                started.set()
+                return True
+
+        root = Root()
+        await root.first
+        await root.second
+
+        assert await root.check_health(timeout=1) == []
+
+    @pytest.mark.asyncio
+    async def test_lazy_not_created_skipped(self):
+        root = make_root()
+        deferred = root.deferred
+
+        assert await root.check_health() == []
+        assert root['created'] == 0
+
+        deferred.healthy = False
+        assert await root.check_health() == ['deferred']
+        assert root['created'] == 1
+        assert root.deferred.number == 2
+
+    @pytest.mark.asyncio
+    async def test_cascade(self):
+        root = make_root()
+        assert root.cursor == (1, )
+        root.db.healthy = False
+
+        await root.check_health()
+        assert root.cursor == (1, )
+
+        root.db.healthy = False
+        await root.check_health(cascade=True)
+        assert root.cursor == (3, )
+
+    @pytest.mark.asyncio
+    async def test_close_errors_raised(self):
+        root = make_root()
+        upstream = await root.upstream
+        upstream.healthy = False
+        root['fail_close'] = True
+
+        with pytest.raises(ValueError):
+            await root.check_health()
+
+        assert await root.upstream is not upstream
+
+    @pytest.mark.asyncio
+    async def test_errors_collected(self):
+        root = make_root()
+        (await root.upstream).healthy = False
+        root['fail_close'] = True
+        root['fail_create'] = True
+
+        with pytest.raises(MultipleExceptions) as ex:
+            await root.check_health()
+
+        assert isinstance(ex.value.exceptions[0], ValueError)
+        assert isinstance(ex.value.exceptions[1], RuntimeError)
+
+    def test_keyed_rejected(self):
+        with pytest.raises(TypeError):
+            class Root(AsyncBaluster):
+
+                @placeholders.keyed
+                def item(self, root, key):
+                    return key
+
+                @item.health
+                def check_item(self, root, item):
+                    return True
+
+
+class TestHealthChecker:
+
+    @pytest.mark.asyncio
+    async def test_periodic(self):
+        root = make_root()
+        db = root.db
+        db.healthy = False
+
+        async with HealthChecker(root, interval=0.001) as checker:
+            assert checker.running
+            for _ in range(100):
+                await asyncio.sleep(0.001)
+                if root.db is not db:
+                    break
+
+        assert not checker.running
+        assert db.closed
+        assert root.db is not db
+
+    @pytest.mark.asyncio
+    async def test_start_stop(self):
+        root = make_root()
+        checker = HealthChecker(root)
+
+        checker.start()
+        checker.start()
+        assert checker.running
+        await checker.stop()
+        await checker.stop()
+        assert not checker.running
+
+    @pytest.mark.asyncio
+    async def test_errors_reported(self):
+        root = make_root()
+        (await root.upstream).healthy = False
+        root['fail_close'] = True
+        root['fail_create'] = True
+        errors = []
+        checker = HealthChecker(
+            root, on_error=lambda r, ex: errors.append((r, ex))
+        )
+
+        await checker.check()
+
+        assert len(errors) == 2
+        assert errors[0][0] is root
+        assert isinstance(errors[0][1], ValueError)
+        assert isinstance(errors[1][1], RuntimeError)
+
+    @pytest.mark.asyncio
+    async def test_errors_to_loop(self):
+        root = make_root()
+        (await root.upstream).healthy = False
+        root['fail_close'] = True
+        contexts = []
+        loop = asyncio.get_event_loop()
+        loop.set_exception_handler(lambda loop, ctx: contexts.append(ctx))
+        try:
+            await HealthChecker(root).check()
+        finally:
+            loop.set_exception_handler(None)
+
+        assert isinstance(contexts[0]['exception'], ValueError)
+
+    @pytest.mark.asyncio
+    async def test_unexpected_error_reported(self):
+        errors = []
+
+        class Broken:
+
+            async def check_health(self, *, cascade, timeout):
+                raise RuntimeError()
+
+        await HealthChecker(
+            Broken(), on_error=lambda r, ex: errors.append(ex)
+        ).check()
+
+        assert isinstance(errors[0], RuntimeError)
+
+    @pytest.mark.asyncio
+    async def test_failing_error_handler(self):
+        root = make_root()
+        (await root.upstream).healthy = False
+        root['fail_close'] = True
+        contexts = []
+
+        def on_error(root, exception):
+            raise KeyError()
+
+        loop = asyncio.get_event_loop()
+        loop.set_exception_handler(lambda loop, ctx: contexts.append(ctx))
+        try:
+            await HealthChecker(root, on_error=on_error).check()
+        finally:
+            loop.set_exception_handler(None)
+
+        assert isinstance(contexts[0]['exception'], KeyError)
+
+    @pytest.mark.asyncio
+    async def test_timeout_passed(self):
+        root = make_root()
+        hanging = await root.hanging
+        hanging.healthy = False
+
+        await asyncio.wait_for(HealthChecker(root, timeout=0.01).check(), 1)
+
+        assert await root.hanging is not hanging
@@ -0,0 +1,123 @@
+import pytest
+
+from baluster import AsyncBaluster, Baluster, placeholders
+
+
+class CompositeRoot(Baluster):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.closed = []
+        self.created = []
+
+    def _create(self, name):
+        self.created.append(name)
+        return name
+
+    @placeholders.factory
+    def db(self, root):
+        return self._create('db')
+
+    @db.close
+    def close_db(self, root, resource):
+        root.closed.append(resource)
+
+    @placeholders.factory
+    def cr(self, root):
+        return self._create('cr:' + root.db)
+
+    @cr.close
+    def close_cr(self, root, resource):
+        root.closed.append(resource)
+
+    @placeholders.factory
+    def unrelated(self, root):
+        return self._create('unrelated')
+
+    class users(Baluster):
+
+        @placeholders.factory
+        def user(self, root):
+            return root._create('user:' + root.cr)
+
+        @user.close
+        def close_user(self, root, resource):
+            root.closed.append(resource)
+
+
+class AsyncCompositeRoot(AsyncBaluster):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.closed = []
+
+    @placeholders.factory
+    def db(self, root):
+        return 'db'
+
+    @db.close
+    def close_db(self, root, resource):
+        root.closed.append(resource)
+
+    @placeholders.factory
+    def cr(self, root):
+        return 'cr:' + root.db
+
+    @cr.close
+    async def close_cr(self, root, resource):
+        root.closed.append(resource)
+
+
+class TestInvalidate:
+
+    def test_invalidate_single(self):
+        root = CompositeRoot()
+        root.users.user
+
+        root.invalidate('db')
+
+        assert root.closed == ['db']
+        assert 'db' not in root._state._resources
+        assert root.cr == 'cr:db'
+
+    def test_cascade(self):
+        root = CompositeRoot()
+        root.users.user
+        root.unrelated
+
+        root.invalidate('db', cascade=True)
+
+        assert root.closed == ['user:cr:db', 'cr:db', 'db']
+        assert root.unrelated == 'unrelated'
+        assert root.users.user == 'user:cr:db'
+        assert root.created == [
+            'db', 'cr:db', 'user:cr:db', 'unrelated',
+            'db', 'cr:db', 'user:cr:db'
+        ]
+
+    def test_invalidate_not_cached(self):
+        root = CompositeRoot()
+
+        root.invalidate('db', cascade=True)
+
+        assert root.closed == []
+
+    def test_invalidate_nested(self):
+        root = CompositeRoot()
+        root.users.user
+
+        root.users.invalidate('user')
+
+        assert root.closed == ['user:cr:db']
+        assert root.cr == 'cr:db'
+
+    @pytest.mark.asyncio
+    async def test_async_cascade(self):
+        root = AsyncCompositeRoot()
+        root.cr
+
+        await root.ainvalidate('db', cascade=True)
+
+        assert root.closed == ['cr:db', 'db']
+        await root.aclose()
+        assert root.closed == ['cr:db', 'db']
@@ -0,0 +1,269 @@
+import asyncio
+from threading import Barrier, Thread
+from time import sleep
+
+import pytest
+
+from baluster import AsyncBaluster, Baluster, placeholders
+
+
+class User:
+
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.closed = False
+
+
+class CompositeRoot(Baluster):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = []
+
+    class users(Baluster):
+
+        @placeholders.keyed(maxsize=2, inject='user')
+        def user(self, root, user_id):
+            root.calls.append(user_id)
+            return User(user_id)
+
+        @user.close
+        def close_user(self, root, resource):
+            resource.closed = True
+
+        @placeholders.keyed(readonly=True, args=['root', 'prefix'])
+        def name(self, root, prefix, user_id):
+            return '{}{}'.format(prefix, user_id)
+
+        @placeholders.keyed
+        def slow(self, root, user_id):
+            root.calls.append(user_id)
+            sleep(0.01)
+            return User(user_id)
+
+
+class AsyncCompositeRoot(AsyncBaluster):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = []
+
+    @placeholders.keyed
+    async def tenant_client(self, root, tenant):
+        root.calls.append(tenant)
+        await asyncio.sleep(0)
+        if tenant == 'broken':
+            raise ZeroDivisionError()
+        return 'client:' + tenant
+
+    @placeholders.keyed
+    async def hanging(self, root, tenant):
+        await asyncio.sleep(10)
+
+    @placeholders.keyed
+    async def slow(self, root, tenant):
+        root.calls.append(tenant)
+        await asyncio.sleep(0.01)
+        return 'slow:' + tenant
+
+    @placeholders.keyed(maxsize=1)
+    async def connection(self, root, tenant):
+        return User(tenant)
+
+    @connection.close
+    async def close_connection(self, root, resource):
+        resource.closed = True
+
+
+class FakeBinder:
+
+    def __init__(self):
+        self.bindings = dict()
+
+    def bind_to_provider(self, key, value):
+        self.bindings[key] = value
+
+
+class TestKeyed:
+
+    def test_class_level_access(self):
+        assert CompositeRoot.users.user._name == 'user'
+
+    def test_memoized_per_key(self):
+        root = CompositeRoot()
+
+        user = root.users.user[42]
+
+        assert user.user_id == 42
+        assert root.users.user(42) is user
+        assert root.users.user[43] is not user
+        assert 42 in root.users.user
+        assert 44 not in root.users.user
+        assert root.calls == [42, 43]
+
+    def test_bounded(self):
+        root = CompositeRoot()
+
+        root.users.user[1]
+        root.users.user[2]
+        root.users.user[1]
+        root.users.user[3]
+
+        assert 1 in root.users.user
+        assert 2 not in root.users.user
+        assert 3 in root.users.user
+
+    def test_evicted_closed(self):
+        root = CompositeRoot()
+        first = root.users.user[1]
+        root.users.user[2]
+
+        root.users.user[3]
+
+        assert first.closed is True
+        first.closed = False
+        root.close()
+        assert first.closed is False
+        assert root.users.user[2].closed is True
+
+    def test_evicted_from_parent_kept(self):
+        root = CompositeRoot()
+        shared = root.users.user[1]
+
+        with root.enter() as ctx:
+            ctx.users.user[2]
+            ctx.users.user[3]
+
+        assert shared.closed is False
+
+    def test_close_handler_per_key(self):
+        root = CompositeRoot()
+
+        with root.enter() as ctx:
+            first = ctx.users.user[1]
+            second = ctx.users.user[2]
+
+        assert first.closed is True
+        assert second.closed is True
+
+    def test_child_scope(self):
+        root = CompositeRoot()
+        shared = root.users.user[1]
+
+        with root.enter() as ctx:
+            assert ctx.users.user[1] is shared
+            own = ctx.users.user[2]
+
+        assert 2 not in root.users.user
+        assert own.closed is True
+        assert shared.closed is False
+
+    def test_params_and_set_items(self):
+        root = CompositeRoot(prefix='user-')
+
+        assert root.users.name[1] == 'user-1'
+
+        root.users.user[5] = 'five'
+        assert root.users.user[5] == 'five'
+
+        with pytest.raises(AttributeError):
+            root.users.user[5] = 'other'
+
+        with pytest.raises(AttributeError):
+            root.users.name[2] = 'readonly'
+
+        with pytest.raises(AttributeError):
+            root.users.user = 'invalid'
+
+    def test_autowire_rejected(self):
+        with pytest.raises(TypeError):
+            placeholders.keyed(autowire=True)(lambda self, key: key)
+
+    def test_inject(self):
+        root = CompositeRoot()
+        binder = FakeBinder()
+        root.inject_config(binder)
+
+        assert binder.bindings['user']()[7].user_id == 7
+
+    def test_single_flight_threads(self):
+        root = CompositeRoot()
+        barrier = Barrier(4)
+        results = []
+
+        def target():
+            barrier.wait()
+            results.append(root.users.slow[1])
+
+        threads = [Thread(target=target) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert root.calls == [1]
+        assert len(set(map(id, results))) == 1
+
+    @pytest.mark.asyncio
+    async def test_async_single_flight(self):
+        root = AsyncCompositeRoot()
+
+        results = await asyncio.gather(
+            root.tenant_client('acme'),
+            root.tenant_client['acme'],
+            root.tenant_client('other'),
+        )
+
+        assert results == ['client:acme', 'client:acme', 'client:other']
+        assert root.calls == ['acme', 'other']
+        assert await root.tenant_client('acme') == 'client:acme'
+
+    @pytest.mark.asyncio
+    async def test_async_failure_shared(self):
+        root = AsyncCompositeRoot()
+
+        results = await asyncio.gather(
+            root.tenant_client('broken'),
+            root.tenant_client('broken'),
+            return_exceptions=True
+        )
+
+        assert all(isinstance(r, ZeroDivisionError) for r in results)
+        assert root.calls == ['broken']
+        assert 'broken' not in root.tenant_client
+
+    @pytest.mark.asyncio
+    async def test_async_evicted_closed(self):
+        root = AsyncCompositeRoot()
+        first = await root.connection('acme')
+
+        second = await root.connection('other')
+
+        assert first.closed is True
+        assert second.closed is False
+
+    @pytest.mark.asyncio
+    async def test_async_cancelled_waiter(self):
+        root = AsyncCompositeRoot()
+
+        first = asyncio.ensure_future(root.slow('acme'))
+        second = asyncio.ensure_future(root.slow('acme'))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == 'slow:acme'
+        assert first.cancelled()
+        assert root.calls == ['acme']
+        assert 'acme' in root.slow
+
+    @pytest.mark.asyncio
+    async def test_async_cancelled_on_close(self):
+        root = AsyncCompositeRoot()
+
+        async with root.enter() as ctx:
+            waiter = asyncio.ensure_future(ctx.hanging('acme'))
+            await asyncio.sleep(0)
+
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert 'acme' not in ctx.hanging
@@ -0,0 +1,129 @@
+import pytest
+
+from baluster import Baluster, is_created, placeholders
+
+
+class Connection:
+
+    def __init__(self):
+        self.closed = False
+        self.items = {'a': 1}
+        self.name = 'connection'
+
+    def query(self, sql):
+        return 'result of ' + sql
+
+    def __call__(self):
+        return 'called'
+
+    def __enter__(self):
+        return 'entered'
+
+    def __exit__(self, *args):
+        self.closed = True
+
+
+class CompositeRoot(Baluster):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.opened = 0
+
+    @placeholders.factory(lazy=True)
+    def db(self, root):
+        self.opened += 1
+        return Connection()
+
+    @db.close
+    def close_db(self, root, resource):
+        resource.closed = True
+
+    @placeholders.factory(lazy=True, cache=False)
+    def uncached(self, root):
+        return Connection()
+
+
+class TestLazy:
+
+    def test_async_rejected(self):
+        async def factory(self, root):
+            pass
+
+        with pytest.raises(TypeError):
+            placeholders.factory(factory, lazy=True)
+
+    def test_unused_costs_nothing(self):
+        root = CompositeRoot()
+
+        with root.enter() as ctx:
+            proxy = ctx.db
+            assert ctx.db is proxy
+            assert is_created(proxy) is False
+            assert repr(proxy) == '<LazyProxy (not created)>'
+
+        assert ctx.opened == 0
+        assert ctx._state._close_handlers == []
+
+    def test_created_on_first_use(self):
+        root = CompositeRoot()
+
+        with root.enter() as ctx:
+            proxy = ctx.db
+            assert proxy.query('SELECT 1') == 'result of SELECT 1'
+            assert proxy.name == 'connection'
+            assert is_created(proxy) is True
+            connection = ctx.db
+            assert isinstance(connection, Connection)
+
+        assert ctx.opened == 1
+        assert connection.closed is True
+        assert repr(proxy).startswith('<LazyProxy <')
+
+    def test_forwarding(self):
+        root = CompositeRoot()
+        proxy = root.db
+
+        proxy.name = 'renamed'
+        assert root.db.name == 'renamed'
+        del proxy.name
+        assert not hasattr(root.db, 'name')
+
+        assert proxy() == 'called'
+        with proxy as entered:
+            assert entered == 'entered'
+
+        proxy.items['b'] = 2
+        assert proxy.items == {'a': 1, 'b': 2}
+        assert str(proxy) == str(root.db)
+
+    def test_container_protocol(self):
+        class Holder(Baluster):
+
+            @placeholders.factory(lazy=True)
+            def items(self, root):
+                return {'a': 1}
+
+        proxy = Holder().items
+
+        assert proxy['a'] == 1
+        proxy['b'] = 2
+        del proxy['a']
+        assert 'b' in proxy
+        assert list(proxy) == ['b']
+        assert len(proxy) == 1
+        assert bool(proxy) is True
+        assert proxy == {'b': 2}
+
+    def test_hash(self):
+        class Holder(Baluster):
+
+            @placeholders.factory(lazy=True)
+            def name(self, root):
+                return 'name'
+
+        assert hash(Holder().name) == hash('name')
+
+    def test_uncached(self):
+        root = CompositeRoot()
+
+        assert root.uncached is not root.uncached
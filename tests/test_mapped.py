@@ -0,0 +1,144 @@
+from mmap import mmap
+
+import pytest
+
+from baluster import (
+    Baluster, UnresolvedArgumentError, dependency_graph, placeholders
+)
+
+
+class CompositeRoot(Baluster):
+
+    data = placeholders.mapped('path')
+
+    @placeholders.factory
+    def header(self, root):
+        return root.data[:4]
+
+    class nested(Baluster):
+
+        index = placeholders.mapped('index_path')
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = tmp_path / 'data.bin'
+    path.write_bytes(b'HEAD' + bytes(range(100)))
+    return str(path)
+
+
+class TestMapped:
+
+    def test_mapped_lazily(self, path):
+        root = CompositeRoot(path=path)
+
+        assert not root._state.has_resource('data')
+        assert not list(root._state.get_close_handlers())
+        assert CompositeRoot.data is CompositeRoot.__dict__['data']
+        assert isinstance(root.data, mmap)
+        assert root._state.get_resource('data').opened
+        assert root.data is root.data
+        assert root.header == b'HEAD'
+        assert len(root.data) == 104
+
+    def test_readonly(self, path):
+        root = CompositeRoot(path=path)
+
+        with pytest.raises(TypeError):
+            root.data[0] = 1
+        with pytest.raises(AttributeError):
+            root.data = b''
+
+    def test_missing_param(self):
+        root = CompositeRoot()
+
+        with pytest.raises(UnresolvedArgumentError):
+            root.data
+
+    def test_nested(self, path):
+        root = CompositeRoot(index_path=path)
+
+        assert root.nested.index[:4] == b'HEAD'
+
+    def test_shared_with_scopes(self, path):
+        root = CompositeRoot(path=path)
+        data = root.data
+
+        with root.enter() as ctx:
+            assert ctx.data is data
+
+        assert not data.closed
+        root.close()
+        assert data.closed
+
+    def test_opened_in_scope(self, path):
+        root = CompositeRoot(path=path)
+
+        with root.enter() as ctx:
+            data = ctx.data
+
+        assert data.closed
+        assert not root._state.has_resource('data')
+
+    def test_reopen_after_close(self, path):
+        root = CompositeRoot(path=path)
+        data = root.data
+        root.close()
+
+        reopened = root.data
+
+        assert data.closed
+        assert not reopened.closed
+        root.close()
+        assert reopened.closed
+
+    def test_path_changed(self, path, tmp_path):
+        other = tmp_path / 'other.bin'
+        other.write_bytes(b'NEXT')
+        root = CompositeRoot(path=path)
+        data = root.data
+
+        root.update_params(path=str(other))
+
+        assert root.data[:] == b'NEXT'
+        assert data.closed
+        assert len(list(root._state.get_close_handlers())) == 1
+        root.close()
+        assert not root._state.get_resource('data').opened
+
+    def test_dependents_updated_with_path(self, path, tmp_path):
+        other = tmp_path / 'other.bin'
+        other.write_bytes(b'NEXT')
+        root = CompositeRoot(path=path)
+        assert root.header == b'HEAD'
+
+        root.update_params(path=str(other))
+
+        assert root.header == b'NEXT'
+        assert root.data[:] == b'NEXT'
+
+    def test_param_in_graph(self):
+        graph = dependency_graph(CompositeRoot)
+
+        assert graph.params_of('data') == {'path'}
+        assert graph.params_of('nested.index') == {'index_path'}
+        assert graph.dependents_of_params('path') == {'data', 'header'}
+
+    def test_partial_copy(self, path):
+        root = CompositeRoot(path=path)
+        data = root.data
+
+        copy = root.partial_copy()
+
+        assert copy.data is not data
+        copy.close()
+        assert not data.closed
+
+    def test_invalidate(self, path):
+        root = CompositeRoot(path=path)
+        data = root.data
+
+        root.invalidate('data')
+
+        assert data.closed
+        assert root.data is not data
@@ -18,6 +18,17 @@ class CompositeRoot(Baluster):
         else:
             return 'production'
 
+    @placeholders.factory(
+        cache=False, args=['root', 'count'], kwargs=['name'],
+        defaults={'count': 10, 'name': 'default'}
+    )
+    def described(self, root, count, *, name):
+        return (count, name)
+
+    @placeholders.factory(args=[])
+    def empty_args(self, root):
+        return root
+
 
 class TestParams:
 
@@ -35,3 +46,23 @@ class TestParams:
         obj = CompositeRoot(env={'DEBUG': True}).partial_copy()
 
         assert obj.resource == 'debug'
+
+    def test_falsy_params(self):
+        obj = CompositeRoot(env={}, count=0, name='')
+
+        assert obj.params.debug is False
+        assert obj.described == (0, '')
+
+    def test_defaults_and_keyword_args(self):
+        obj = CompositeRoot()
+
+        assert obj.described == (10, 'default')
+
+        obj = CompositeRoot(name='other')
+
+        assert obj.described == (10, 'other')
+
+    def test_empty_args_pass_root(self):
+        obj = CompositeRoot()
+
+        assert obj.empty_args is obj
@@ -0,0 +1,132 @@
+import asyncio
+
+import pytest
+
+from baluster import AsyncBaluster, current_scope, placeholders
+
+
+class Connection:
+
+    def __init__(self, name):
+        self.name = name
+        self.closed = False
+
+
+class CompositeRoot(AsyncBaluster):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.started = []
+
+    @placeholders.factory
+    async def db(self, root):
+        root.started.append('db')
+        await asyncio.sleep(0.01)
+        return Connection('db')
+
+    @db.close
+    async def close_db(self, root, resource):
+        resource.closed = True
+
+    @placeholders.factory
+    def config(self, root):
+        return 'config'
+
+    class cache(AsyncBaluster):
+
+        @placeholders.factory
+        async def client(self, root):
+            root.started.append('cache.client')
+            await asyncio.sleep(10)
+            return Connection('cache')
+
+    @placeholders.factory
+    async def broken(self, root):
+        raise ZeroDivisionError()
+
+
+class TestPrefetch:
+
+    @pytest.mark.asyncio
+    async def test_single_flight(self):
+        root = CompositeRoot()
+
+        first, second = await asyncio.gather(root.db, root.db)
+
+        assert first is second
+        assert root.started == ['db']
+
+    @pytest.mark.asyncio
+    async def test_failure_not_cached(self):
+        root = CompositeRoot()
+
+        with pytest.raises(ZeroDivisionError):
+            await root.broken
+        with pytest.raises(ZeroDivisionError):
+            await root.broken
+
+    @pytest.mark.asyncio
+    async def test_prefetch_started_on_enter(self):
+        root = CompositeRoot()
+
+        async with root.enter(prefetch=['db']) as ctx:
+            assert ctx.started == []
+            await asyncio.sleep(0)
+            assert ctx.started == ['db']
+            connection = await ctx.db
+            assert ctx.started == ['db']
+
+        assert connection.closed is True
+
+    @pytest.mark.asyncio
+    async def test_cancelled_on_exit(self):
+        root = CompositeRoot()
+
+        async with root.enter(prefetch=['db', 'cache.client']) as ctx:
+            await asyncio.sleep(0.05)
+
+        assert ctx.started == ['db', 'cache.client']
+        assert ctx._state.get_resource('db').closed is True
+        assert 'cache.client' not in ctx._state._resources
+        assert ctx._state.get_pending('cache.client') is None
+
+    @pytest.mark.asyncio
+    async def test_sync_factory_rejected(self):
+        root = CompositeRoot()
+        manager = root.enter(prefetch=['db', 'config'], publish=True)
+
+        with pytest.raises(TypeError):
+            async with manager:
+                pass
+
+        assert current_scope(None) is None
+        await asyncio.sleep(0)
+        assert root.started == []
+
+    @pytest.mark.asyncio
+    async def test_unknown_name(self):
+        root = CompositeRoot()
+
+        with pytest.raises(AttributeError):
+            async with root.enter(prefetch=['missing'], publish=True):
+                pass
+
+        assert current_scope(None) is None
+
+    @pytest.mark.asyncio
+    async def test_prefetch_already_resolved(self):
+        root = CompositeRoot()
+        await root.db
+
+        assert root.prefetch('db') == []
+        assert root.prefetch('db') == []
+
+    @pytest.mark.asyncio
+    async def test_prefetch_in_flight(self):
+        root = CompositeRoot()
+
+        first, = root.prefetch('db')
+        second, = root.prefetch('db')
+
+        assert first is second
+        assert (await first) is (await root.db)
@@ -0,0 +1,193 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+import os
+from os import getpid
+import pickle
+
+import pytest
+
+from baluster import AsyncBaluster, placeholders
+from baluster.fork import reset_after_fork
+from baluster.process import call_in_process
+
+
+class CompositeRoot(AsyncBaluster):
+
+    @placeholders.factory(executor='process', args=['size'])
+    def table(self, size):
+        return getpid(), [i * i for i in range(size)]
+
+    @table.close
+    def close_table(self, root, resource):
+        root.closed.append(resource)
+
+    @placeholders.factory(executor='process', args=['size'], cache=False)
+    def rows(self, size):
+        return getpid(), size
+
+    @rows.batch
+    def rows_batch(self, size, count):
+        return [(getpid(), size + i) for i in range(count)]
+
+    @placeholders.factory(
+        executor='process', kwargs=['size'], defaults={'size': 3},
+        cache=False
+    )
+    def numbers(self, *, size):
+        return list(range(size))
+
+    @placeholders.factory
+    def closed(self, root):
+        return []
+
+
+pool = ProcessPoolExecutor(1)
+
+
+class PoolRoot(AsyncBaluster):
+
+    @placeholders.factory(executor=pool)
+    def pid(self):
+        return getpid()
+
+
+class TestProcess:
+
+    def test_async_factory_rejected(self):
+        async def factory(self, size):
+            pass
+
+        with pytest.raises(TypeError):
+            placeholders.factory(factory, executor='process')
+
+    def test_root_argument_rejected(self):
+        with pytest.raises(TypeError):
+            class Root(AsyncBaluster):
+
+                @placeholders.factory(executor='process', args=['root'])
+                def value(self, root):
+                    pass
+
+    @pytest.mark.asyncio
+    async def test_pool_executor_instance(self):
+        worker = pool.submit(getpid).result()
+        root = PoolRoot()
+
+        assert await root.pid == worker
+        await root.aclose()
+
+    @pytest.mark.asyncio
+    async def test_close_shuts_down_pool(self):
+        root = CompositeRoot(size=1)
+        await root.rows
+        pool = root._state.get_process_pool()
+
+        root.close()
+
+        assert pool._shutdown_thread
+
+    @pytest.mark.asyncio
+    async def test_pool_dropped_after_fork(self):
+        root = CompositeRoot(size=1)
+        await root.rows
+        pool = root._state.get_process_pool()
+
+        reset_after_fork()
+
+        assert root._state.get_process_pool() is not pool
+        pool.shutdown()
+        assert (await root.rows)[1] == 1
+        await root.aclose()
+
+    @pytest.mark.skipif(
+        not hasattr(os, 'fork'), reason='Requires os.fork'
+    )
+    def test_fork(self):
+        loop = asyncio.new_event_loop()
+        root = CompositeRoot(size=2)
+        loop.run_until_complete(root.rows)
+        read, write = os.pipe()
+
+        pid = os.fork()
+        if pid == 0:
+            os.close(read)
+            child_loop = asyncio.new_event_loop()
+            try:
+                result = child_loop.run_until_complete(
+                    asyncio.wait_for(root.rows, 5)
+                )[1]
+                child_loop.run_until_complete(root.aclose())
+            except BaseException as ex:
+                result = repr(ex)
+            os.write(write, pickle.dumps(result))
+            os._exit(0)
+        os.close(write)
+        with os.fdopen(read, 'rb') as f:
+            result = pickle.loads(f.read())
+        os.waitpid(pid, 0)
+        loop.run_until_complete(root.aclose())
+        loop.close()
+
+        assert result == 2
+
+    @pytest.mark.asyncio
+    async def test_runs_in_process_and_cached(self):
+        root = CompositeRoot(size=4)
+
+        async with root.enter() as scope:
+            pid, table = await scope.table
+
+            assert pid != getpid()
+            assert table == [0, 1, 4, 9]
+            assert await scope.table == (pid, table)
+            closed = scope.closed
+
+        await root.aclose()
+        assert closed == [(pid, table)]
+
+    @pytest.mark.asyncio
+    async def test_pool_shared_with_scopes(self):
+        root = CompositeRoot(size=2)
+        async with root.enter() as scope:
+            assert (await scope.rows)[1] == 2
+        pool = root._state.get_process_pool()
+
+        async with root.enter() as scope:
+            await scope.rows
+            assert scope._state.get_process_pool() is pool
+
+        await root.aclose()
+
+        assert pool._shutdown_thread
+
+    @pytest.mark.asyncio
+    async def test_keyword_defaults(self):
+        root = CompositeRoot()
+
+        assert await root.numbers == [0, 1, 2]
+        await root.aclose()
+
+    @pytest.mark.asyncio
+    async def test_build_many(self):
+        root = CompositeRoot(size=1)
+
+        rows = await root.build_many('rows', 3)
+        sized = await root.build_many('rows', 2, size=5)
+        await root.aclose()
+
+        assert [size for pid, size in rows] == [1, 2, 3]
+        assert [size for pid, size in sized] == [5, 6]
+
+    @pytest.mark.asyncio
+    async def test_build_many_without_batch(self):
+        root = CompositeRoot()
+
+        values = await root.build_many('numbers', 2, size=2)
+        await root.aclose()
+
+        assert values == [[0, 1], [0, 1]]
+
+    def test_call_in_process(self):
+        assert call_in_process(
+            __name__, 'CompositeRoot.numbers', [], {'size': 2}
+        ) == [0, 1]
@@ -0,0 +1,296 @@
+import asyncio
+from unittest import mock
+
+import pytest
+
+from baluster import AsyncBaluster, Baluster, Retry, placeholders
+
+
+class Flaky:
+
+    def __init__(self, failures, exception=ConnectionError):
+        self.failures = failures
+        self.exception = exception
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.exception()
+        return 'connection'
+
+
+class CompositeRoot(Baluster):
+
+    @placeholders.factory(retry=Retry(3, backoff=0))
+    def db(self, root):
+        return root['db']()
+
+    @placeholders.factory(failure_ttl=60)
+    def upstream(self, root):
+        return root['upstream']()
+
+    @placeholders.factory(
+        retry=Retry(2, backoff=0, exceptions=(ConnectionError, ))
+    )
+    def selective(self, root):
+        return root['selective']()
+
+    @placeholders.factory
+    def plain(self, root):
+        return root['plain']()
+
+    @placeholders.keyed(retry=Retry(2, backoff=0), failure_ttl=60)
+    def item(self, root, key):
+        return root['item']()
+
+    @placeholders.factory(args=['dsn'], failure_ttl=60)
+    def connection(self, dsn):
+        if dsn != 'good':
+            raise ConnectionError()
+        return dsn
+
+
+class AsyncRoot(AsyncBaluster):
+
+    @placeholders.factory(retry=Retry(3, backoff=0), failure_ttl=60)
+    async def db(self, root):
+        await asyncio.sleep(0)
+        return root['db']()
+
+    @placeholders.keyed(retry=Retry(2, backoff=0), failure_ttl=60)
+    async def item(self, root, key):
+        return root['item']()
+
+    @placeholders.batched(retry=Retry(2, backoff=0))
+    async def batch(self, root, keys):
+        return [root['item']() for key in keys]
+
+    @placeholders.factory(retry=Retry(2, backoff=0), timeout=0.01)
+    async def hung(self, root):
+        root['calls'] = root['calls'] + 1
+        await asyncio.sleep(10)
+
+
+class TestRetry:
+
+    def test_at_least_one_attempt(self):
+        with pytest.raises(ValueError):
+            Retry(0)
+
+    def test_delay(self):
+        retry = Retry(5, backoff=1, max_backoff=3, jitter=0)
+
+        assert [retry.delay(i, ValueError()) for i in range(5)] == \
+            [1, 2, 3, 3, None]
+
+    def test_jitter(self):
+        retry = Retry(backoff=1, jitter=0.5)
+
+        assert all(1 <= retry.delay(0, ValueError()) <= 1.5
+                   for _ in range(20))
+
+    def test_not_retried_exceptions(self):
+        retry = Retry(exceptions=(ConnectionError, ))
+
+        assert retry.delay(0, ValueError()) is None
+
+    def test_retried(self):
+        root = CompositeRoot()
+        root['db'] = Flaky(2)
+
+        assert root.db == 'connection'
+        assert root.get_stats() == {'db': {'attempts': 3, 'retries': 2}}
+
+    def test_attempts_exhausted(self):
+        root = CompositeRoot()
+        root['db'] = Flaky(3)
+
+        with pytest.raises(ConnectionError):
+            root.db
+
+        assert root.get_stats()['db'] == {
+            'attempts': 3, 'retries': 2, 'failures': 1
+        }
+        assert root.db == 'connection'
+
+    def test_backoff_sleeps(self):
+        sleep = mock.Mock()
+
+        class Root(Baluster):
+
+            @placeholders.factory(
+                retry=Retry(3, backoff=1, jitter=0, sleep=sleep)
+            )
+            def db(self, root):
+                return root['db']()
+
+        root = Root()
+        root['db'] = Flaky(2)
+
+        assert root.db == 'connection'
+        assert sleep.call_args_list == [mock.call(1), mock.call(2)]
+
+    def test_keyed(self):
+        root = CompositeRoot()
+        root['item'] = flaky = Flaky(1)
+
+        assert root.item['a'] == 'connection'
+        assert root.get_stats()['item'] == {'attempts': 2, 'retries': 1}
+        assert flaky.calls == 2
+
+    def test_keyed_negative_cache_per_key(self):
+        root = CompositeRoot()
+        root['item'] = flaky = Flaky(3)
+
+        with pytest.raises(ConnectionError):
+            root.item['a']
+        with pytest.raises(ConnectionError):
+            root.item['a']
+        assert root.item['b'] == 'connection'
+
+        assert flaky.calls == 4
+        assert root.get_stats()['item']['fast_failures'] == 1
+
+    def test_selective(self):
+        root = CompositeRoot()
+        root['selective'] = Flaky(1, ValueError)
+
+        with pytest.raises(ValueError):
+            root.selective
+
+        assert root.get_stats()['selective']['attempts'] == 1
+
+    def test_negative_cache(self):
+        root = CompositeRoot()
+        root['upstream'] = flaky = Flaky(1)
+
+        with pytest.raises(ConnectionError):
+            root.upstream
+        with pytest.raises(ConnectionError):
+            root.upstream
+        with root.enter() as ctx:
+            with pytest.raises(ConnectionError):
+                ctx.upstream
+
+        assert flaky.calls == 1
+        assert root.get_stats()['upstream'] == {
+            'attempts': 1, 'failures': 1, 'fast_failures': 2
+        }
+
+    def test_negative_cache_expires(self):
+        root = CompositeRoot()
+        root['upstream'] = Flaky(1)
+
+        with mock.patch('baluster.state.monotonic', return_value=0):
+            with pytest.raises(ConnectionError):
+                root.upstream
+        with mock.patch('baluster.state.monotonic', return_value=61):
+            assert root.upstream == 'connection'
+
+    def test_negative_cache_cleared_on_invalidate(self):
+        root = CompositeRoot()
+        root['upstream'] = Flaky(1)
+        root['item'] = Flaky(2)
+
+        with pytest.raises(ConnectionError):
+            root.upstream
+        with pytest.raises(ConnectionError):
+            root.item['a']
+        root.invalidate('upstream')
+        root.invalidate('item')
+
+        assert root.upstream == 'connection'
+        assert root.item['a'] == 'connection'
+
+    def test_negative_cache_cleared_on_update_params(self):
+        root = CompositeRoot(dsn='bad')
+
+        with pytest.raises(ConnectionError):
+            root.connection
+        root.update_params(dsn='good')
+
+        assert root.connection == 'good'
+
+    @pytest.mark.asyncio
+    async def test_async_negative_cache_cleared(self):
+        root = AsyncRoot()
+        root['db'] = Flaky(3)
+
+        with pytest.raises(ConnectionError):
+            await root.db
+        await root.ainvalidate('db')
+
+        assert await root.db == 'connection'
+
+    def test_no_policy_no_stats(self):
+        root = CompositeRoot()
+        root['plain'] = Flaky(1)
+
+        with pytest.raises(ConnectionError):
+            root.plain
+
+        assert root.plain == 'connection'
+        assert root.get_stats() == {}
+
+    @pytest.mark.asyncio
+    async def test_async(self):
+        root = AsyncRoot()
+        root['db'] = Flaky(2)
+
+        assert await root.db == 'connection'
+        assert root.get_stats()['db'] == {'attempts': 3, 'retries': 2}
+
+    @pytest.mark.asyncio
+    async def test_async_negative_cache(self):
+        root = AsyncRoot()
+        root['db'] = flaky = Flaky(5)
+
+        with pytest.raises(ConnectionError):
+            await root.db
+        with pytest.raises(ConnectionError):
+            await root.db
+
+        assert flaky.calls == 3
+        assert root.get_stats()['db']['fast_failures'] == 1
+
+    @pytest.mark.asyncio
+    async def test_async_timeout_retried(self):
+        root = AsyncRoot()
+        root['calls'] = 0
+
+        with pytest.raises(asyncio.TimeoutError):
+            await root.hung
+
+        assert root['calls'] == 2
+
+    @pytest.mark.asyncio
+    async def test_async_keyed(self):
+        root = AsyncRoot()
+        root['item'] = flaky = Flaky(3)
+
+        with pytest.raises(ConnectionError):
+            await root.item('a')
+        with pytest.raises(ConnectionError):
+            await root.item('a')
+        assert await root.item('b') == 'connection'
+
+        assert flaky.calls == 4
+        assert root.get_stats()['item'] == {
+            'attempts': 4, 'retries': 2, 'failures': 1, 'fast_failures': 1
+        }
+
+    @pytest.mark.asyncio
+    async def test_batched(self):
+        root = AsyncRoot()
+        root['item'] = Flaky(1)
+
+        assert await root.batch(1) == 'connection'
+        assert root.get_stats()['batch'] == {'attempts': 2, 'retries': 1}
+
+    def test_batched_negative_cache_rejected(self):
+        async def batch(self, root, keys):
+            pass
+
+        with pytest.raises(TypeError):
+            placeholders.batched(batch, failure_ttl=1)
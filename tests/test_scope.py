@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+from baluster import (
+    AsyncBaluster, Baluster, NoCurrentScopeError, current_scope, placeholders
+)
+
+
+class CompositeRoot(Baluster):
+
+    @placeholders.factory
+    def value(self, root):
+        return object()
+
+
+class AsyncCompositeRoot(AsyncBaluster):
+
+    @placeholders.factory
+    def value(self, root):
+        return object()
+
+
+class TestCurrentScope:
+
+    def test_no_current_scope(self):
+        with pytest.raises(NoCurrentScopeError):
+            current_scope()
+
+        assert current_scope(None) is None
+
+    def test_not_published_by_default(self):
+        root = CompositeRoot()
+
+        with root.enter():
+            assert current_scope(None) is None
+
+    def test_publish(self):
+        root = CompositeRoot()
+
+        with root.enter(publish=True) as ctx:
+            assert current_scope() is ctx
+            with ctx.enter(publish=True) as inner:
+                assert current_scope() is inner
+            assert current_scope() is ctx
+
+        assert current_scope(None) is None
+
+    def test_unpublished_when_close_fails(self):
+        root = CompositeRoot()
+
+        with pytest.raises(ZeroDivisionError):
+            with root.enter(publish=True):
+                raise ZeroDivisionError()
+
+        assert current_scope(None) is None
+
+    @pytest.mark.asyncio
+    async def test_task_isolation(self):
+        root = AsyncCompositeRoot()
+
+        async def handler():
+            async with root.enter(publish=True) as ctx:
+                await asyncio.sleep(0)
+                child = asyncio.ensure_future(spawned())
+                assert await child is ctx
+                assert current_scope() is ctx
+                return ctx.value
+
+        async def spawned():
+            await asyncio.sleep(0)
+            return current_scope()
+
+        first, second = await asyncio.gather(handler(), handler())
+
+        assert first is not second
+        assert current_scope(None) is None
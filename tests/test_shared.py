@@ -0,0 +1,116 @@
+import os
+import pickle
+from multiprocessing import get_context
+
+import pytest
+
+from baluster import Baluster, placeholders
+from baluster.shared import SharedBuffer
+
+pytest.importorskip('multiprocessing.shared_memory')
+
+
+def read_shared(buffer):
+    return bytes(buffer)
+
+
+class CompositeRoot(Baluster):
+
+    @placeholders.shared
+    def table(self, root):
+        return bytes(range(10))
+
+    @table.close
+    def close_table(self, root, resource):
+        root.closed.append(bytes(resource))
+
+    @placeholders.shared(lazy=True)
+    def empty(self, root):
+        return b''
+
+    @placeholders.factory
+    def closed(self, root):
+        return []
+
+
+class TestShared:
+
+    def test_async_factory_rejected(self):
+        async def factory(self, root):
+            pass
+
+        with pytest.raises(TypeError):
+            placeholders.shared(factory)
+
+    def test_missing_shared_memory(self, monkeypatch):
+        monkeypatch.setattr('baluster.makers.SharedMemory', None)
+
+        with pytest.raises(RuntimeError):
+            placeholders.shared(lambda self, root: b'')
+
+    def test_shared_buffer(self):
+        root = CompositeRoot()
+
+        table = root.table
+
+        assert isinstance(table, SharedBuffer)
+        assert root.table is table
+        assert len(table) == table.size == 10
+        assert table.buf[3] == 3
+        assert table.buf.readonly
+        assert repr(table).startswith('<SharedBuffer')
+        root.close()
+
+    def test_unlinked_by_close(self):
+        root = CompositeRoot()
+        table = root.table
+        closed = root.closed
+
+        root.close()
+
+        assert closed == [bytes(range(10))]
+        with pytest.raises(FileNotFoundError):
+            pickle.loads(pickle.dumps(table))
+
+    def test_attach_by_pickle(self):
+        root = CompositeRoot()
+        table = root.table
+
+        attached = pickle.loads(pickle.dumps(table))
+
+        assert attached.name == table.name
+        assert bytes(attached) == bytes(table)
+        attached.release()
+        assert bytes(root.table) == bytes(range(10))
+        root.close()
+
+    def test_empty_value(self):
+        root = CompositeRoot()
+
+        assert root.empty.size == 0
+        assert bytes(root.empty.buf) == b''
+        root.close()
+
+    def test_other_process(self):
+        root = CompositeRoot()
+        table = root.table
+
+        with get_context('spawn').Pool(1) as pool:
+            assert pool.apply(read_shared, (table, )) == bytes(range(10))
+        root.close()
+
+    @pytest.mark.skipif(
+        not hasattr(os, 'fork'), reason='Requires os.fork'
+    )
+    def test_not_unlinked_by_forked_child(self):
+        root = CompositeRoot()
+        table = root.table
+
+        pid = os.fork()
+        if pid == 0:
+            root.close()
+            os._exit(0)
+        os.waitpid(pid, 0)
+
+        assert bytes(pickle.loads(pickle.dumps(table))) == bytes(range(10))
+        root.close()
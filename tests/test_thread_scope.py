@@ -0,0 +1,127 @@
+from threading import Thread
+
+from baluster import Baluster, placeholders
+
+
+class Connection:
+
+    def __init__(self):
+        self.closed = False
+
+
+class CompositeRoot(Baluster):
+
+    @placeholders.factory
+    def config(self, root):
+        return object()
+
+    @placeholders.factory
+    def pool(self, root):
+        return Connection()
+
+    @pool.close
+    def close_pool(self, root, resource):
+        resource.closed = True
+
+    @placeholders.factory(thread_local=True)
+    def connection(self, root):
+        return Connection()
+
+    @connection.close
+    def close_connection(self, root, resource):
+        resource.closed = True
+
+    @placeholders.keyed
+    def users(self, root, key):
+        return object()
+
+    class sub(Baluster):
+
+        @placeholders.factory
+        def config(self, root):
+            return object()
+
+
+def run_in_thread(target):
+    results = []
+    thread = Thread(target=lambda: results.append(target()))
+    thread.start()
+    thread.join()
+    return results[0]
+
+
+class TestThreadScope:
+
+    def test_same_scope_within_thread(self):
+        root = CompositeRoot()
+
+        def target():
+            scope = root.thread_scope()
+            assert root.thread_scope() is scope
+            assert scope.connection is scope.connection
+            return scope
+
+        first = run_in_thread(target)
+        second = run_in_thread(target)
+
+        assert first is not second
+        assert first.connection is not second.connection
+
+    def test_app_level_resources_shared(self):
+        root = CompositeRoot()
+        config = root.config
+
+        scope = run_in_thread(root.thread_scope)
+
+        assert scope.config is config
+
+    def test_app_level_resources_resolved_on_root(self):
+        root = CompositeRoot()
+
+        def target():
+            scope = root.thread_scope()
+            with scope.enter() as request:
+                return scope.config, request.pool, scope.users[1]
+
+        first = run_in_thread(target)
+        second = run_in_thread(target)
+
+        assert first == second
+        assert first == (root.config, root.pool, root.users[1])
+        assert root.pool.closed is False
+        root.close()
+        assert root.pool.closed is True
+
+    def test_nested_thread_scope(self):
+        root = CompositeRoot()
+
+        def target():
+            scope = root.sub.thread_scope()
+            assert scope is root.thread_scope().sub
+            return scope.config
+
+        assert run_in_thread(target) is root.sub.config
+
+    def test_closed_on_thread_exit(self):
+        root = CompositeRoot()
+
+        connection = run_in_thread(lambda: root.thread_scope().connection)
+
+        assert connection.closed is True
+
+    def test_requests_within_thread(self):
+        root = CompositeRoot()
+
+        def target():
+            scope = root.thread_scope()
+            connection = scope.connection
+            with scope.enter() as request:
+                assert request.connection is connection
+            with scope.enter() as request:
+                assert request.connection is connection
+            assert connection.closed is False
+            return connection
+
+        connection = run_in_thread(target)
+
+        assert connection.closed is True
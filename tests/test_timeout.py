@@ -0,0 +1,378 @@
+import asyncio
+from time import sleep
+
+import pytest
+
+from baluster import AsyncBaluster, placeholders
+
+
+class Connection:
+
+    def __init__(self):
+        self.closed = False
+
+
+async def connect_late(root, keys):
+    try:
+        await asyncio.sleep(10)
+    except asyncio.CancelledError:
+        await asyncio.sleep(0)
+    connections = [Connection() for _ in keys]
+    root.created.extend(connections)
+    return connections
+
+
+class CompositeRoot(AsyncBaluster):
+
+    @placeholders.factory(timeout=0.01)
+    async def hung(self, root):
+        await asyncio.sleep(10)
+
+    @placeholders.factory(timeout=0.01)
+    async def stubborn(self, root):
+        connection = Connection()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            await asyncio.sleep(0)
+        return connection
+
+    @stubborn.close
+    def close_stubborn(self, root, resource):
+        resource.closed = True
+
+    @placeholders.factory
+    async def persistent(self, root):
+        connection = Connection()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            await asyncio.sleep(0)
+        root.created.append(connection)
+        return connection
+
+    @persistent.close
+    def close_persistent(self, root, resource):
+        resource.closed = True
+
+    @placeholders.factory(executor=True)
+    def blocking_untimed(self, root):
+        sleep(0.05)
+        connection = Connection()
+        root.created.append(connection)
+        return connection
+
+    @blocking_untimed.close
+    def close_blocking_untimed(self, root, resource):
+        resource.closed = True
+
+    @placeholders.factory(timeout=1)
+    async def quick(self, root):
+        return Connection()
+
+    @placeholders.factory
+    async def slow(self, root):
+        await asyncio.sleep(0.05)
+        return Connection()
+
+    @slow.close
+    async def close_slow(self, root, resource):
+        resource.closed = True
+
+    @placeholders.factory(cache=False)
+    async def uncached(self, root):
+        await asyncio.sleep(0.01)
+        connection = Connection()
+        root.created.append(connection)
+        return connection
+
+    @uncached.close
+    def close_uncached(self, root, resource):
+        resource.closed = True
+
+    @placeholders.factory(executor=True, timeout=0.05)
+    def blocking(self, root):
+        sleep(0.1)
+        connection = Connection()
+        root.created.append(connection)
+        return connection
+
+    @blocking.close
+    def close_blocking(self, root, resource):
+        resource.closed = True
+
+    @placeholders.keyed(timeout=0.01)
+    async def hung_item(self, root, key):
+        await asyncio.sleep(10)
+
+    @placeholders.keyed
+    async def slow_item(self, root, key):
+        await asyncio.sleep(0.05)
+
+    @placeholders.batched
+    async def slow_batch(self, root, keys):
+        return dict(zip(keys, await connect_late(root, keys)))
+
+    @slow_batch.close
+    def close_slow_batch(self, root, resource):
+        resource.closed = True
+
+    @placeholders.batched(timeout=0.01)
+    async def hung_batch(self, root, keys):
+        return await connect_late(root, keys)
+
+    @hung_batch.close
+    def close_hung_batch(self, root, resource):
+        resource.closed = True
+
+    @placeholders.factory
+    def created(self, root):
+        return []
+
+
+class TestTimeout:
+
+    @pytest.mark.asyncio
+    async def test_timeout(self):
+        root = CompositeRoot()
+
+        with pytest.raises(asyncio.TimeoutError):
+            await root.hung
+
+        assert not root._state.has_resource('hung')
+
+    @pytest.mark.asyncio
+    async def test_waiters_released(self):
+        root = CompositeRoot()
+        loop = asyncio.get_event_loop()
+        started = loop.time()
+
+        results = await asyncio.gather(
+            root.hung, root.hung, return_exceptions=True
+        )
+
+        assert [type(r) for r in results] == [asyncio.TimeoutError] * 2
+        assert loop.time() - started < 1
+
+    @pytest.mark.asyncio
+    async def test_late_value_closed(self):
+        root = CompositeRoot()
+
+        with pytest.raises(asyncio.TimeoutError):
+            await root.stubborn
+        await asyncio.sleep(0.01)
+
+        assert not root._state.has_resource('stubborn')
+        assert root._state.get_pending('stubborn') is None
+
+    @pytest.mark.asyncio
+    async def test_late_value_close_handler(self):
+        closed = []
+
+        class Root(AsyncBaluster):
+
+            @placeholders.factory(timeout=0.01)
+            async def stubborn(self, root):
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    await asyncio.sleep(0)
+                return 'connection'
+
+            @stubborn.close
+            async def close_stubborn(self, root, resource):
+                closed.append(resource)
+
+            @placeholders.factory(timeout=0.01)
+            async def failing(self, root):
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    raise ZeroDivisionError()
+
+        root = Root()
+        with pytest.raises(asyncio.TimeoutError):
+            await root.stubborn
+        with pytest.raises(asyncio.TimeoutError):
+            await root.failing
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+        assert closed == ['connection']
+
+    @pytest.mark.asyncio
+    async def test_within_timeout(self):
+        root = CompositeRoot()
+
+        assert await root.quick is await root.quick
+
+    @pytest.mark.asyncio
+    async def test_scope_deadline(self):
+        root = CompositeRoot()
+
+        async with root.enter(timeout=0.01) as ctx:
+            with pytest.raises(asyncio.TimeoutError):
+                await ctx.slow
+            async with ctx.enter() as inner:
+                with pytest.raises(asyncio.TimeoutError):
+                    await inner.slow
+
+        assert isinstance(await root.slow, Connection)
+
+    @pytest.mark.asyncio
+    async def test_deadline_passed(self):
+        root = CompositeRoot()
+
+        async with root.enter(timeout=0) as ctx:
+            with pytest.raises(asyncio.TimeoutError):
+                await ctx.quick
+
+    @pytest.mark.asyncio
+    async def test_factory_timeout_shorter_than_deadline(self):
+        root = CompositeRoot()
+
+        async with root.enter(timeout=5) as ctx:
+            with pytest.raises(asyncio.TimeoutError):
+                await ctx.hung
+            assert isinstance(await ctx.quick, Connection)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_uncached_stopped(self):
+        root = CompositeRoot()
+
+        async with root.enter() as ctx:
+            task = asyncio.ensure_future(ctx.uncached)
+            await asyncio.sleep(0)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            await asyncio.sleep(0.02)
+            created = ctx.created
+
+        assert created == []
+
+    @pytest.mark.asyncio
+    async def test_cancelled_handler_creation_stopped(self):
+        root = CompositeRoot()
+
+        async def handler():
+            async with root.enter() as ctx:
+                scopes.append(ctx)
+                await ctx.slow
+
+        scopes = []
+        task = asyncio.ensure_future(handler())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0.1)
+
+        assert not scopes[0]._state.has_resource('slow')
+        assert list(scopes[0]._state.get_close_handlers()) == []
+
+    @pytest.mark.asyncio
+    async def test_cancelled_handler_late_value_closed(self):
+        root = CompositeRoot()
+
+        async def handler():
+            async with root.enter() as ctx:
+                created.append(ctx.created)
+                await ctx.persistent
+
+        created = []
+        task = asyncio.ensure_future(handler())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert [c.closed for c in created[0]] == [True]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_handler_executor_value_closed(self):
+        root = CompositeRoot()
+
+        async def handler():
+            async with root.enter() as ctx:
+                created.append(ctx.created)
+                await ctx.blocking_untimed
+
+        created = []
+        task = asyncio.ensure_future(handler())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        for _ in range(50):
+            await asyncio.sleep(0.01)
+            if created[0] and created[0][0].closed:
+                break
+
+        assert [c.closed for c in created[0]] == [True]
+
+    @pytest.mark.asyncio
+    async def test_executor_late_value_closed(self):
+        root = CompositeRoot()
+
+        with pytest.raises(asyncio.TimeoutError):
+            await root.blocking
+        assert root.created == []
+        for _ in range(50):
+            await asyncio.sleep(0.01)
+            if root.created:
+                break
+
+        assert root.created[0].closed
+        assert not root._state.has_resource('blocking')
+
+    @pytest.mark.asyncio
+    async def test_keyed_timeout(self):
+        root = CompositeRoot()
+
+        with pytest.raises(asyncio.TimeoutError):
+            await root.hung_item('acme')
+        assert 'acme' not in root.hung_item
+
+        async with root.enter(timeout=0.01) as ctx:
+            with pytest.raises(asyncio.TimeoutError):
+                await ctx.slow_item('acme')
+
+    @pytest.mark.asyncio
+    async def test_batched_deadline(self):
+        root = CompositeRoot()
+
+        async with root.enter(timeout=0.01) as ctx:
+            created = ctx.created
+            results = await asyncio.gather(
+                ctx.slow_batch(1), ctx.slow_batch(2), return_exceptions=True
+            )
+            for _ in range(10):
+                await asyncio.sleep(0)
+
+        assert [type(r) for r in results] == [asyncio.TimeoutError] * 2
+        assert [c.closed for c in created] == [True, True]
+
+    @pytest.mark.asyncio
+    async def test_batched_timeout(self):
+        root = CompositeRoot()
+
+        with pytest.raises(asyncio.TimeoutError):
+            await root.hung_batch(1)
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+        assert [c.closed for c in root.created] == [True]
+
+    def test_sync_keyed_timeout_rejected(self):
+        with pytest.raises(TypeError):
+            placeholders.keyed(lambda self, root, key: key, timeout=1)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_prefetch_with_deadline(self):
+        root = CompositeRoot()
+
+        async with root.enter(prefetch=['slow'], timeout=1) as ctx:
+            await asyncio.sleep(0)
+
+        assert not ctx._state.has_resource('slow')
@@ -0,0 +1,100 @@
+import pytest
+
+from baluster import AsyncBaluster, Baluster, placeholders
+
+
+class CompositeRoot(Baluster):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.built = []
+        self.closed = []
+
+    @placeholders.factory(args=['root', 'feature'])
+    def flags(self, root, feature):
+        root.built.append('flags')
+        return {'feature': feature}
+
+    @flags.close
+    def close_flags(self, root, resource):
+        root.closed.append('flags')
+
+    @placeholders.factory
+    def handler(self, root):
+        root.built.append('handler')
+        return ('handler', root.flags['feature'])
+
+    @placeholders.factory(autowire=True)
+    def db(self, dsn):
+        self.built.append('db')
+        return dsn
+
+
+class AsyncCompositeRoot(AsyncBaluster):
+
+    closed = False
+
+    @placeholders.factory(args=['root', 'feature'])
+    def flags(self, root, feature):
+        return feature
+
+    @flags.close
+    async def close_flags(self, root, resource):
+        self.closed = True
+
+
+class TestUpdateParams:
+
+    def test_rebuild_affected_only(self):
+        root = CompositeRoot(feature=False, dsn='db://')
+        assert root.handler == ('handler', False)
+        root.db
+
+        root.update_params(feature=True)
+
+        assert root.closed == ['flags']
+        assert root.handler == ('handler', True)
+        assert root.db == 'db://'
+        assert root.built == ['handler', 'flags', 'db', 'handler', 'flags']
+
+    def test_unchanged_value(self):
+        root = CompositeRoot(feature=False)
+        root.handler
+
+        root.update_params(feature=False)
+
+        assert root.closed == []
+
+    def test_equal_value(self):
+        root = CompositeRoot(feature=('a', 'b'))
+        root.handler
+
+        root.update_params(feature=tuple('ab'))
+
+        assert root.closed == []
+
+    def test_new_param(self):
+        root = CompositeRoot()
+        assert root.flags == {'feature': None}
+
+        root.update_params(feature=True)
+
+        assert root.flags == {'feature': True}
+
+    def test_existing_scopes_keep_params(self):
+        root = CompositeRoot(feature=False)
+
+        with root.enter() as ctx:
+            root.update_params(feature=True)
+            assert ctx.flags == {'feature': False}
+            assert root.flags == {'feature': True}
+
+    @pytest.mark.asyncio
+    async def test_async_close_handlers(self):
+        root = AsyncCompositeRoot(feature=False)
+        root.flags
+
+        await root.aupdate_params(feature=True)
+
+        assert root.closed is True
+        assert root.flags is True